@@ -1,4 +1,6 @@
 from app.internal.exception.error_message import ErrorMessage
 
 JSON_PARSING_ERROR=ErrorMessage(-401, "LLM 답변 JSON 변환 실패")
-INVALID_DATA_TYPE=ErrorMessage(-402, "잘못된 데이터 타입")
\ No newline at end of file
+INVALID_DATA_TYPE=ErrorMessage(-402, "잘못된 데이터 타입")
+LLM_QUEUE_FULL=ErrorMessage(-403, "LLM 요청 대기열 초과")
+LLM_QUEUE_TIMEOUT=ErrorMessage(-404, "LLM 요청 대기 시간 초과")
\ No newline at end of file
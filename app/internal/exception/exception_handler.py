@@ -1,11 +1,10 @@
 import logging
 
 from fastapi import FastAPI, Request
-from fastapi.encoders import jsonable_encoder
 from starlette.responses import JSONResponse
 
 from app.internal.exception.controlled_exception import ControlledException
-from config.common.common_response import CommonResponse
+from config.common.common_response import CommonJSONResponse, CommonResponse
 
 
 def global_exception_handlers(app: FastAPI):
@@ -30,9 +29,9 @@ def global_exception_handlers(app: FastAPI):
             message= exception.error_code.message,
         )
 
-        return JSONResponse(
+        return CommonJSONResponse(
             status_code=400,
-            content=jsonable_encoder(body)
+            content=body
         )
 
     @app.exception_handler(Exception)
@@ -53,7 +52,7 @@ def global_exception_handlers(app: FastAPI):
             code=500,
             message="알 수 없는 에러",
         )
-        return JSONResponse(
+        return CommonJSONResponse(
             status_code=500,
-            content=jsonable_encoder(body)
+            content=body
         )
\ No newline at end of file
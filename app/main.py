@@ -1,10 +1,37 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from fastapi import FastAPI
 
+from app.routers.chat.chat_controller import router as chat_router
 from app.routers.users.users_controller import router
-app = FastAPI(title="common-fastapi")
+from config.database.async_postgres_database import AsyncPostgresDatabase
+
+# 실행 시 임베딩 모델을 미리 불러올지 여부 (기본값: 첫 임베딩 요청 시 불러온다)
+EMBEDDING_WARMUP = os.getenv("EMBEDDING_WARMUP", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    FastAPI 실행/종료 시 수행되는 함수
+
+    실행 시 비동기 ConnectionPool을 열고, 종료 시 닫는다.
+    EMBEDDING_WARMUP=1 이라면 실행 시 임베딩 모델을 미리 불러온다.
+    """
+    await AsyncPostgresDatabase().open()
+    if EMBEDDING_WARMUP:
+        from config.models.embedding_model import embedding_model
+        await asyncio.to_thread(embedding_model.warmup)
+    yield
+    await AsyncPostgresDatabase().close()
+
+app = FastAPI(title="common-fastapi", lifespan=lifespan)
 
-app.include_router(router)
\ No newline at end of file
+app.include_router(router)
+app.include_router(chat_router)
@@ -0,0 +1,52 @@
+import json
+import logging
+
+from fastapi import APIRouter
+from starlette import status
+from starlette.responses import StreamingResponse
+
+from app.internal.exception.controlled_exception import ControlledException
+from app.routers.chat import chat_service
+from app.routers.chat.chat_dto import ChatDTO
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+
+def _event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post(
+    "/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK
+)
+async def stream_message(chat_dto: ChatDTO):
+    """
+    LLM의 답변(message)을 생성되는 대로 SSE(text/event-stream)로 전달한다.
+
+    - message: {"delta": "<답변 조각>"}
+    - done: {} *답변이 끝남
+    - error: {"code": <에러 코드>, "message": "<에러 메세지>"} *스트림이 시작된 뒤 발생한 예외
+        - ControlledException이 아닌 예외는 {"code": 500, "message": "알 수 없는 에러"}로 전달한다. (exception_handler와 같은 규칙)
+    """
+    async def events():
+        try:
+            async for delta in chat_service.astream_message(chat_dto):
+                yield _event("message", {"delta": delta})
+        except ControlledException as exception:
+            logging.exception(msg=f"\n\n[ControlledException 예외 발생]\n[POST] /chat/stream 에서 에러 발생: {exception}\n")
+            yield _event("error", {"code": exception.error_code.code, "message": exception.error_code.message})
+            return
+        except Exception as exception:
+            # 응답 헤더가 이미 전달되었으므로 exception_handler 대신 error 이벤트로 알린다.
+            logging.exception(f"\n\n[POST]\n/chat/stream 에서 에러 발생: {exception}\n")
+            yield _event("error", {"code": 500, "message": "알 수 없는 에러"})
+            return
+        yield _event("done", {})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # 프록시(nginx 등)가 이벤트를 모아 보내지 않도록 한다.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
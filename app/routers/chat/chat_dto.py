@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class ChatDTO(BaseModel):
+    """
+    채팅 요청
+
+    Attributes:
+        input(str): 사용자의 입력
+        use_cache(bool): False라면 LLM 응답 캐시를 사용하지 않는다.
+    """
+    input: str
+    use_cache: bool = True
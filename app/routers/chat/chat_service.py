@@ -0,0 +1,8 @@
+from typing import AsyncIterator
+
+from app.routers.chat.chat_dto import ChatDTO
+from config.llm.main_llm import MainLLM
+
+
+def astream_message(chat_dto: ChatDTO) -> AsyncIterator[str]:
+    return MainLLM().astream({"input": chat_dto.input}, use_cache=chat_dto.use_cache)
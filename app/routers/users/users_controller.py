@@ -1,13 +1,22 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette import status
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 
 from app.routers.users import users_service
 from app.routers.users.users import Users
-from app.routers.users.users_dto import UsersDTO
-from config.common.common_response import CommonResponse
+from app.routers.users.users_dto import UsersBulkDeleteDTO, UsersBulkResult, UsersDTO, UsersPage
+from app.routers.users.users_repository import USERS_BULK_CHUNK_SIZE
+from config.common.common_cache import CacheStats
+from config.common.common_response import CommonJSONResponse, CommonResponse
 
-router = APIRouter(prefix="/users", tags=["users"])
+"""
+CommonResponse를 반환하는 경로는 CommonJSONResponse로 감싸 반환한다.
+response_model은 OpenAPI 문서에만 사용되고, 응답은 검증 없이 한 번만 직렬화된다.
+"""
+router = APIRouter(prefix="/users", tags=["users"], default_response_class=CommonJSONResponse)
+
+# NDJSON 스트리밍 시 한 번에 전달할 유저 수 (첫 응답까지의 지연을 줄이기 위해 작게 유지한다)
+_NDJSON_CHUNK_ROWS = 64
 
 @router.post(
     "",
@@ -15,9 +24,48 @@ router = APIRouter(prefix="/users", tags=["users"])
     status_code=status.HTTP_200_OK,
 )
 async def create_user(users_dto: UsersDTO, response: Response):
-    user = users_service.create(users_dto)
+    user = await users_service.acreate(users_dto)
+
+    return CommonJSONResponse(CommonResponse(code=200, message="유저 생성 성공", data=user))
 
-    return CommonResponse(code=200, message="유저 생성 성공", data=user)
+@router.post(
+    "/bulk",
+    response_model=CommonResponse[list[UsersBulkResult]],
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_create(
+        users_dtos: list[UsersDTO],
+        response: Response,
+        chunk_size: int = Query(USERS_BULK_CHUNK_SIZE, ge=1, le=10000, description="하나의 SQL에 담을 유저 수")
+):
+    results = await users_service.abulk_create(users_dtos, chunk_size)
+    return CommonJSONResponse(CommonResponse(code=200, message="유저 일괄 생성 성공", data=results))
+
+@router.put(
+    "/bulk",
+    response_model=CommonResponse[list[UsersBulkResult]],
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_upsert(
+        users_dtos: list[UsersDTO],
+        response: Response,
+        chunk_size: int = Query(USERS_BULK_CHUNK_SIZE, ge=1, le=10000, description="하나의 SQL에 담을 유저 수")
+):
+    results = await users_service.abulk_upsert(users_dtos, chunk_size)
+    return CommonJSONResponse(CommonResponse(code=200, message="유저 일괄 생성/수정 성공", data=results))
+
+@router.delete(
+    "/bulk",
+    response_model=CommonResponse[list[UsersBulkResult]],
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_delete(
+        users_bulk_delete_dto: UsersBulkDeleteDTO,
+        response: Response,
+        chunk_size: int = Query(USERS_BULK_CHUNK_SIZE, ge=1, le=10000, description="하나의 SQL에 담을 id 수")
+):
+    results = await users_service.abulk_delete(users_bulk_delete_dto.ids, chunk_size)
+    return CommonJSONResponse(CommonResponse(code=200, message="유저 일괄 삭제 성공", data=results))
 
 @router.patch(
     "",
@@ -25,8 +73,8 @@ async def create_user(users_dto: UsersDTO, response: Response):
     status_code=status.HTTP_200_OK
 )
 async def update(users_dto: UsersDTO, response: Response):
-    user = users_service.update(users_dto)
-    return CommonResponse(code=200, message="유저 수정 성공", data=user)
+    user = await users_service.aupdate(users_dto)
+    return CommonJSONResponse(CommonResponse(code=200, message="유저 수정 성공", data=user))
 
 @router.delete(
     "",
@@ -34,17 +82,57 @@ async def update(users_dto: UsersDTO, response: Response):
     status_code=status.HTTP_200_OK
 )
 async def delete(users_dto: UsersDTO, response: Response):
-    user = users_service.delete(users_dto)
-    return CommonResponse(code=200, message="유저 삭제 성공", data=user)
+    user = await users_service.adelete(users_dto)
+    return CommonJSONResponse(CommonResponse(code=200, message="유저 삭제 성공", data=user))
 
 @router.get(
     "",
-    response_model=CommonResponse[list[Users]],
+    response_model=CommonResponse[UsersPage],
+    status_code=status.HTTP_200_OK
+)
+async def get_all(
+        response: Response,
+        after_id: int = Query(0, ge=0, description="이전 페이지의 마지막 id"),
+        limit: int = Query(100, ge=1, le=1000, description="조회할 최대 유저 수")
+):
+    users = await users_service.afind_page(after_id, limit)
+    # limit보다 적게 조회되었다면 마지막 페이지이다.
+    next_after_id = users[-1].id if len(users) == limit else None
+    page = UsersPage(users=users, next_after_id=next_after_id)
+    return CommonJSONResponse(CommonResponse(code=200, message="유저 전체 조회 성공", data=page))
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK
+)
+async def stream_all(
+        batch_size: int = Query(1000, ge=1, le=10000, description="서버에서 한 번에 가져올 유저 수")
+):
+    """
+    전체 유저를 NDJSON(한 줄에 유저 한 명)으로 스트리밍한다.
+    batch_size와 관계없이 _NDJSON_CHUNK_ROWS명씩 전달하므로, 첫 응답은 첫 묶음이 조회되는 즉시 전달된다.
+    """
+    async def ndjson():
+        lines = []
+        async for user in users_service.astream_all(batch_size):
+            lines.append(user.model_dump_json())
+            if len(lines) >= _NDJSON_CHUNK_ROWS:
+                yield "\n".join(lines) + "\n"
+                lines.clear()
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@router.get(
+    "/cache/stats",
+    response_model=CommonResponse[CacheStats],
     status_code=status.HTTP_200_OK
 )
-async def get_all(response: Response):
-    users = users_service.find_all()
-    return CommonResponse(code=200, message="유저 전체 조회 성공", data=users)
+async def read_cache_stats(response: Response):
+    stats = users_service.cache_stats()
+    return CommonJSONResponse(CommonResponse(code=200, message="유저 캐시 통계 조회 성공", data=stats))
 
 @router.get(
     "/{id}",
@@ -52,12 +140,12 @@ async def get_all(response: Response):
     status_code=status.HTTP_200_OK
 )
 async def read_by_id(id: int, response: Response):
-    user = users_service.find_by_id(id)
-    return CommonResponse(
+    user = await users_service.afind_by_id(id)
+    return CommonJSONResponse(CommonResponse(
         code=200,
         message="유저 조회 성공",
         data=user
-    )
+    ))
 
 @router.get(
     "/email/{email}",
@@ -65,12 +153,12 @@ async def read_by_id(id: int, response: Response):
     status_code=status.HTTP_200_OK
 )
 async def read_by_email(email: str, response: Response):
-    user = users_service.find_by_email(email)
-    return CommonResponse(
+    user = await users_service.afind_by_email(email)
+    return CommonJSONResponse(CommonResponse(
         code=200,
         message="유저 조회 성공",
         data=user
-    )
+    ))
 
 @router.get(
     "/username/{username}",
@@ -78,9 +166,9 @@ async def read_by_email(email: str, response: Response):
     status_code=status.HTTP_200_OK
 )
 async def read_by_username(username: str, response: Response):
-    user = users_service.find_by_username(username)
-    return CommonResponse(
+    user = await users_service.afind_by_username(username)
+    return CommonJSONResponse(CommonResponse(
         code=200,
         message="유저 조회 성공",
         data=user
-    )
\ No newline at end of file
+    ))
\ No newline at end of file
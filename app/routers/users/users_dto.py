@@ -1,7 +1,10 @@
 from datetime import datetime
+from typing import Literal, Optional
 
 from pydantic import BaseModel
 
+from app.routers.users.users import Users
+
 
 class UsersDTO(BaseModel):
     id: int
@@ -9,4 +12,47 @@ class UsersDTO(BaseModel):
     password: str
     username: str
     created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
\ No newline at end of file
+    updated_at: datetime = datetime.now()
+
+
+class UsersBulkDeleteDTO(BaseModel):
+    """
+    유저 일괄 삭제 요청
+
+    Attributes:
+        ids(list[int]): 삭제할 유저 id
+    """
+    ids: list[int]
+
+
+class UsersBulkResult(BaseModel):
+    """
+    유저 일괄 처리 요청의 항목별 결과
+
+    Attributes:
+        index(int): 요청 목록에서의 위치
+        status(str): 처리 결과
+            - created: 생성됨
+            - updated: 이미 존재하여 수정됨
+            - deleted: 삭제됨
+            - conflict: 같은 email의 유저가 이미 존재하여 생성하지 않음
+            - not_found: 삭제할 유저가 존재하지 않음
+            - duplicate: 요청 목록 안에서 중복되어 다른 항목의 결과를 따름
+        data(Users): 처리된 유저 *default: None
+    """
+    index: int
+    status: Literal["created", "updated", "deleted", "conflict", "not_found", "duplicate"]
+    data: Optional[Users] = None
+
+
+
+class UsersPage(BaseModel):
+    """
+    keyset 페이지네이션으로 조회한 유저 목록
+
+    Attributes:
+        users(list[Users]): 조회된 유저
+        next_after_id(int): 다음 페이지 요청 시 after_id로 전달할 값 *마지막 페이지라면 None
+    """
+    users: list[Users]
+    next_after_id: Optional[int] = None
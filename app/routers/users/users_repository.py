@@ -1,10 +1,169 @@
-from datetime import datetime
-from typing import Optional
+import os
+import threading
+from typing import AsyncIterator, Callable, Hashable, Iterator, Optional
 
 from app.routers.users.users import Users
+from app.routers.users.users_dto import UsersBulkResult
+from config.cache.memory_cache import MemoryCache
+from config.common.common_cache import CacheStats, CommonCache
+from config.database.async_postgres_database import AsyncPostgresDatabase
 from config.database.postgres_database import PostgresDatabase
 
+USERS_CACHE_MAX_SIZE = int(os.getenv("USERS_CACHE_MAX_SIZE", "10000"))
+USERS_CACHE_TTL = float(os.getenv("USERS_CACHE_TTL", "60"))
+USERS_BULK_CHUNK_SIZE = int(os.getenv("USERS_BULK_CHUNK_SIZE", "1000"))
+
 database = PostgresDatabase()
+async_database = AsyncPostgresDatabase()
+
+"""
+유저 조회(id, email) 결과를 담는 read-through 캐시이다.
+하나의 유저는 id를 대표 key로, email을 별칭으로 저장한다.
+username은 UNIQUE가 아니어서 같은 key가 여러 유저를 가리킬 수 있으므로 캐시하지 않는다.
+외부 캐시를 사용하려면 CommonCache 구현체로 교체해주세요.
+"""
+cache: CommonCache = MemoryCache(max_size=USERS_CACHE_MAX_SIZE, ttl=USERS_CACHE_TTL)
+
+"""
+조회 중에 쓰기가 일어났다면, 조회 결과(쓰기 이전의 행)를 캐시하지 않기 위한 버전 정보이다.
+쓰기는 전역 버전을 올리고, 삭제하는 key가 속한 칸(stripe)에 그 버전을 기록한다.
+조회는 시작 시점의 버전보다 큰 버전이 결과 행의 key 칸에 기록되어 있다면 캐시하지 않는다. (다른 key와 칸이 겹치면 캐시를 건너뛸 뿐이다)
+"""
+_WRITE_STRIPES = 4096
+_written_versions = [0] * _WRITE_STRIPES
+_version = 0
+_version_lock = threading.Lock()
+
+"""
+SQL
+동기(database) 함수와 비동기(async_database) 함수가 같은 SQL을 사용한다.
+"""
+_INSERT_SQL = "INSERT INTO users (email, password, username, created_at, updated_at) VALUES (%s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP) RETURNING *"
+# None으로 전달된 항목은 기존 값을 유지한다.
+_UPDATE_SQL = "UPDATE users SET email=COALESCE(%s, email), password=COALESCE(%s, password), username=COALESCE(%s, username), updated_at=CURRENT_TIMESTAMP WHERE id = %s RETURNING *"
+_UPSERT_SQL_TEMPLATE = """
+        INSERT INTO public.users (email, password, username)
+        VALUES {values}
+        ON CONFLICT (email) DO UPDATE
+          SET password   = EXCLUDED.password,
+              username   = EXCLUDED.username,
+              updated_at = CURRENT_TIMESTAMP
+        RETURNING id, email, password, username, created_at, updated_at, (xmax = 0) AS inserted
+        """
+_UPSERT_SQL = _UPSERT_SQL_TEMPLATE.format(values="(%s, %s, %s)")
+_BULK_INSERT_SQL_TEMPLATE = """
+        INSERT INTO public.users (email, password, username)
+        VALUES {values}
+        ON CONFLICT (email) DO NOTHING
+        RETURNING id, email, password, username, created_at, updated_at
+        """
+_BULK_DELETE_SQL = "DELETE FROM users WHERE id = ANY(%s) RETURNING *"
+_DELETE_SQL = "DELETE FROM users WHERE id = %s RETURNING *"
+_FIND_BY_ID_SQL = "SELECT * FROM users WHERE id = %s"
+_FIND_BY_EMAIL_SQL = "SELECT * FROM users WHERE email = %s"
+_FIND_BY_USERNAME_SQL = "SELECT * FROM users WHERE username = %s"
+_FIND_ALL_SQL = "SELECT * FROM public.users"
+_FIND_PAGE_SQL = "SELECT * FROM public.users WHERE id > %s ORDER BY id LIMIT %s"
+_STREAM_ALL_SQL = "SELECT * FROM public.users ORDER BY id"
+
+"""
+Write
+수정된 행을 RETURNING으로 돌려받아, 한 번의 SQL로 쓰기와 조회를 함께 수행한다.
+"""
+def _write(sql: str, values: tuple) -> Optional[Users]:
+    rows = database.execute_batch([(sql, values)])[0]
+    return Users(**rows[0]) if rows else None
+
+async def _awrite(sql: str, values: tuple) -> Optional[Users]:
+    rows = (await async_database.execute_batch([(sql, values)]))[0]
+    return Users(**rows[0]) if rows else None
+
+"""
+Cache
+"""
+def _cache_get(key: str) -> Optional[Users]:
+    user = cache.get(key)
+    # 호출자가 반환된 객체를 수정해도 캐시가 오염되지 않도록 복사본을 반환한다.
+    return user.model_copy() if user is not None else None
+
+def _cache_version() -> int:
+    """
+    조회를 시작하기 전에 호출하여, _cache_put()에 전달할 버전을 반환한다.
+    """
+    with _version_lock:
+        return _version
+
+def _cache_put(rows: list, version: int) -> Optional[Users]:
+    if not rows:
+        return None
+    user = Users(**rows[0])
+    key, alias = f"id:{user.id}", f"email:{user.email}"
+    with _version_lock:
+        # 조회 중에 이 유저에 대한 쓰기가 있었다면, 조회한 행이 이미 오래된 값일 수 있다.
+        if all(_written_versions[hash(k) % _WRITE_STRIPES] <= version for k in (key, alias)):
+            cache.set(key=key, value=user, aliases=(alias,))
+    return user.model_copy()
+
+def _cache_evict(user: Users):
+    global _version
+    keys = [f"email:{user.email}"]
+    if user.id is not None:
+        keys.append(f"id:{user.id}")
+
+    # 버전을 먼저 기록해야, 이후에 _cache_put()하려는 이전 조회가 캐시하지 않는다.
+    with _version_lock:
+        _version += 1
+        for key in keys:
+            _written_versions[hash(key) % _WRITE_STRIPES] = _version
+    for key in keys:
+        cache.delete(key)
+
+def cache_stats() -> CacheStats:
+    return cache.stats()
+
+"""
+Bulk
+여러 유저를 chunk_size 단위의 다중 행 SQL로 나누어, 하나의 트랜잭션에서 처리한다.
+"""
+def _positions(keys: list[Hashable], keep_last: bool) -> dict[Hashable, int]:
+    """
+    요청 목록에서 중복된 key를 제거하고, key별로 실제 처리할 항목의 위치를 반환한다.
+    """
+    positions = {}
+    for index, key in enumerate(keys):
+        if keep_last or key not in positions:
+            positions[key] = index
+    return positions
+
+def _write_statements(sql_template: str, users: list[Users], chunk_size: int) -> Iterator[tuple[str, tuple]]:
+    for start in range(0, len(users), chunk_size):
+        chunk = users[start:start + chunk_size]
+        yield (
+            sql_template.format(values=", ".join(["(%s, %s, %s)"] * len(chunk))),
+            tuple(value for user in chunk for value in (user.email, user.password, user.username))
+        )
+
+def _delete_statements(ids: list[int], chunk_size: int) -> Iterator[tuple[str, tuple]]:
+    for start in range(0, len(ids), chunk_size):
+        yield _BULK_DELETE_SQL, (ids[start:start + chunk_size],)
+
+def _bulk_results(keys: list[Hashable], positions: dict[Hashable, int], rows: dict[Hashable, dict],
+                  found_status: Callable[[dict], str], missing_status: str) -> list[UsersBulkResult]:
+    results = []
+    for index, key in enumerate(keys):
+        if positions[key] != index:
+            results.append(UsersBulkResult(index=index, status="duplicate"))
+        elif key in rows:
+            results.append(UsersBulkResult(index=index, status=found_status(rows[key]), data=Users(**rows[key])))
+        else:
+            results.append(UsersBulkResult(index=index, status=missing_status))
+    return results
+
+def _bulk_evict(users: list[Users], rows: list[dict]):
+    for user in users:
+        _cache_evict(user)
+    for row in rows:
+        _cache_evict(Users(**row))
 
 def create_users() -> str:
     database.execute_update(
@@ -24,74 +183,299 @@ def has_tone()->bool:
     )
 
 def insert_into(user: Users) -> Users:
-    database.execute_update(
-        sql="INSERT INTO users (email, password, username, created_at, updated_at) VALUES (%s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
-        values=(user.email, user.password, user.username, user.created_at, datetime.now()),
+    _user = _write(
+        sql=_INSERT_SQL,
+        values=(user.email, user.password, user.username),
     )
-    return user
+    _cache_evict(user)
+    return _user
 
-def update_into(user: Users) -> Users:
-    database.execute_update(
-        sql="UPDATE users SET email=%s, password=%s, username=%s, updated_at=CURRENT_TIMESTAMP WHERE id = %s",
+def update_into(user: Users) -> Optional[Users]:
+    """
+    유저를 수정하고 수정된 유저를 반환한다. 해당 id의 유저가 없다면 None을 반환한다.
+    """
+    _user = _write(
+        sql=_UPDATE_SQL,
         values=(user.email, user.password, user.username, user.id),
     )
-    return user
+    _cache_evict(user)
+    return _user
 
 def upsert_into(user: Users) -> Users:
-    user = database.execute_query(
-        sql="""
-        INSERT INTO public.users (email, password, username)
-        VALUES (%s, %s, %s)
-        ON CONFLICT (email) DO UPDATE
-          SET password   = EXCLUDED.password,
-              username   = EXCLUDED.username,
-              updated_at = CURRENT_TIMESTAMP
-        RETURNING id, email, password, username, created_at, updated_at
-        """,
+    _user = _write(
+        sql=_UPSERT_SQL,
         values=(user.email, user.password, user.username),
     )
-    return user
+    _cache_evict(user)
+    return _user
 
-def save(user: Users) -> Users:
+def save(user: Users) -> Optional[Users]:
     return update_into(user)
 
-def delete_users(user: Users) -> Users:
-    database.execute_update(
-        sql="DELETE FROM users WHERE id = %s",
+def delete_users(user: Users) -> Optional[Users]:
+    """
+    유저를 삭제하고 삭제된 유저를 반환한다. 해당 id의 유저가 없다면 None을 반환한다.
+    """
+    _user = _write(
+        sql=_DELETE_SQL,
         values=(user.id,),
     )
-    return user
+    if _user is not None:
+        _cache_evict(_user)
+    _cache_evict(user)
+    return _user
 
 def has_user(id: int) -> bool:
     user = database.execute_query(
-        sql="SELECT * FROM users WHERE id = %s",
+        sql=_FIND_BY_ID_SQL,
         values=(id,),
+        prepare=True
     )
     return bool(user)
 
+def bulk_insert_into(users: list[Users], chunk_size: int = USERS_BULK_CHUNK_SIZE) -> list[UsersBulkResult]:
+    """
+    유저를 일괄 생성하는 함수
+
+    이미 존재하는 email은 생성하지 않고 conflict로, 요청 안에서 중복된 email은 첫 항목만 처리한다.
+
+    Parameters:
+        users(list[Users]): 생성할 유저
+        chunk_size(int): 하나의 INSERT 문에 담을 유저 수
+    """
+    emails = [user.email for user in users]
+    positions = _positions(emails, keep_last=False)
+    targets = [users[index] for index in positions.values()]
+
+    rows = [row for result in database.execute_batch(_write_statements(_BULK_INSERT_SQL_TEMPLATE, targets, chunk_size)) for row in result]
+    _bulk_evict(targets, rows)
+
+    return _bulk_results(emails, positions, {row["email"]: row for row in rows}, lambda row: "created", "conflict")
+
+def bulk_upsert_into(users: list[Users], chunk_size: int = USERS_BULK_CHUNK_SIZE) -> list[UsersBulkResult]:
+    """
+    유저를 email 기준으로 일괄 생성/수정하는 함수
+
+    요청 안에서 중복된 email은 마지막 항목만 처리한다.
+
+    Parameters:
+        users(list[Users]): 생성/수정할 유저
+        chunk_size(int): 하나의 INSERT 문에 담을 유저 수
+    """
+    emails = [user.email for user in users]
+    positions = _positions(emails, keep_last=True)
+    targets = [users[index] for index in positions.values()]
+
+    rows = [row for result in database.execute_batch(_write_statements(_UPSERT_SQL_TEMPLATE, targets, chunk_size)) for row in result]
+    _bulk_evict(targets, rows)
+
+    return _bulk_results(emails, positions, {row["email"]: row for row in rows},
+                         lambda row: "created" if row["inserted"] else "updated", "conflict")
+
+def bulk_delete_users(ids: list[int], chunk_size: int = USERS_BULK_CHUNK_SIZE) -> list[UsersBulkResult]:
+    """
+    유저를 id로 일괄 삭제하는 함수
+
+    Parameters:
+        ids(list[int]): 삭제할 유저 id
+        chunk_size(int): 하나의 DELETE 문에 담을 id 수
+    """
+    positions = _positions(ids, keep_last=False)
+
+    rows = [row for result in database.execute_batch(_delete_statements(list(positions), chunk_size)) for row in result]
+    _bulk_evict([], rows)
+
+    return _bulk_results(ids, positions, {row["id"]: row for row in rows}, lambda row: "deleted", "not_found")
+
 def find_by_id(id: int) -> Optional[Users]:
-    user = database.execute_query(
-        sql="SELECT * FROM users WHERE id = %s",
-        values=(id,)
-    )
-    return Users(**user[0]) if user else None
+    user = _cache_get(f"id:{id}")
+    if user is not None:
+        return user
+
+    version = _cache_version()
+    return _cache_put(database.execute_query(
+        sql=_FIND_BY_ID_SQL,
+        values=(id,),
+        prepare=True
+    ), version)
 
 def find_by_email(email: str) -> Optional[Users]:
-    user = database.execute_query(
-        sql="SELECT * FROM users WHERE email = %s",
-        values=(email,)
-    )
-    return Users(**user[0]) if user else None
+    user = _cache_get(f"email:{email}")
+    if user is not None:
+        return user
+
+    version = _cache_version()
+    return _cache_put(database.execute_query(
+        sql=_FIND_BY_EMAIL_SQL,
+        values=(email,),
+        prepare=True
+    ), version)
 
 def find_by_username(username: str) -> Optional[Users]:
-    user = database.execute_query(
-        sql="SELECT * FROM users WHERE username = %s",
-        values=(username,)
+    # username은 UNIQUE가 아니므로 캐시를 사용하지 않는다.
+    users = database.execute_query(
+        sql=_FIND_BY_USERNAME_SQL,
+        values=(username,),
+        prepare=True
     )
-    return Users(**user[0]) if user else None
+    return Users(**users[0]) if users else None
 
 def find_all() -> Optional[list[Users]]:
     users = database.execute_query(
-        sql="SELECT * FROM public.users"
+        sql=_FIND_ALL_SQL
+    )
+    return [Users(**user) for user in users]
+
+def find_page(after_id: int = 0, limit: int = 100) -> list[Users]:
+    """
+    id 기준 keyset 페이지네이션으로 유저를 조회하는 함수
+
+    Parameters:
+        after_id(int): 이전 페이지의 마지막 id (이 id보다 큰 유저부터 조회한다)
+        limit(int): 조회할 최대 유저 수
+    """
+    users = database.execute_query(
+        sql=_FIND_PAGE_SQL,
+        values=(after_id, limit),
+        prepare=True
+    )
+    return [Users(**user) for user in users]
+
+def stream_all(batch_size: int = 1000) -> Iterator[Users]:
+    """
+    서버 측 cursor로 전체 유저를 id 순서대로 한 명씩 반환하는 generator 함수
+
+    Parameters:
+        batch_size(int): 서버에서 한 번에 가져올 유저 수
+    """
+    for user in database.execute_stream(sql=_STREAM_ALL_SQL, batch_size=batch_size):
+        yield Users(**user)
+
+"""
+Async
+이벤트 루프를 막지 않는 비동기 함수이다. FastAPI의 async 핸들러에서는 이 함수들을 이용해주세요.
+"""
+async def ainsert_into(user: Users) -> Users:
+    _user = await _awrite(
+        sql=_INSERT_SQL,
+        values=(user.email, user.password, user.username),
+    )
+    _cache_evict(user)
+    return _user
+
+async def aupdate_into(user: Users) -> Optional[Users]:
+    _user = await _awrite(
+        sql=_UPDATE_SQL,
+        values=(user.email, user.password, user.username, user.id),
+    )
+    _cache_evict(user)
+    return _user
+
+async def aupsert_into(user: Users) -> Users:
+    _user = await _awrite(
+        sql=_UPSERT_SQL,
+        values=(user.email, user.password, user.username),
+    )
+    _cache_evict(user)
+    return _user
+
+async def asave(user: Users) -> Optional[Users]:
+    return await aupdate_into(user)
+
+async def adelete_users(user: Users) -> Optional[Users]:
+    _user = await _awrite(
+        sql=_DELETE_SQL,
+        values=(user.id,),
+    )
+    if _user is not None:
+        _cache_evict(_user)
+    _cache_evict(user)
+    return _user
+
+async def ahas_user(id: int) -> bool:
+    user = await async_database.execute_query(
+        sql=_FIND_BY_ID_SQL,
+        values=(id,),
+        prepare=True
+    )
+    return bool(user)
+
+async def abulk_insert_into(users: list[Users], chunk_size: int = USERS_BULK_CHUNK_SIZE) -> list[UsersBulkResult]:
+    emails = [user.email for user in users]
+    positions = _positions(emails, keep_last=False)
+    targets = [users[index] for index in positions.values()]
+
+    rows = [row for result in await async_database.execute_batch(_write_statements(_BULK_INSERT_SQL_TEMPLATE, targets, chunk_size)) for row in result]
+    _bulk_evict(targets, rows)
+
+    return _bulk_results(emails, positions, {row["email"]: row for row in rows}, lambda row: "created", "conflict")
+
+async def abulk_upsert_into(users: list[Users], chunk_size: int = USERS_BULK_CHUNK_SIZE) -> list[UsersBulkResult]:
+    emails = [user.email for user in users]
+    positions = _positions(emails, keep_last=True)
+    targets = [users[index] for index in positions.values()]
+
+    rows = [row for result in await async_database.execute_batch(_write_statements(_UPSERT_SQL_TEMPLATE, targets, chunk_size)) for row in result]
+    _bulk_evict(targets, rows)
+
+    return _bulk_results(emails, positions, {row["email"]: row for row in rows},
+                         lambda row: "created" if row["inserted"] else "updated", "conflict")
+
+async def abulk_delete_users(ids: list[int], chunk_size: int = USERS_BULK_CHUNK_SIZE) -> list[UsersBulkResult]:
+    positions = _positions(ids, keep_last=False)
+
+    rows = [row for result in await async_database.execute_batch(_delete_statements(list(positions), chunk_size)) for row in result]
+    _bulk_evict([], rows)
+
+    return _bulk_results(ids, positions, {row["id"]: row for row in rows}, lambda row: "deleted", "not_found")
+
+async def afind_by_id(id: int) -> Optional[Users]:
+    user = _cache_get(f"id:{id}")
+    if user is not None:
+        return user
+
+    version = _cache_version()
+    return _cache_put(await async_database.execute_query(
+        sql=_FIND_BY_ID_SQL,
+        values=(id,),
+        prepare=True
+    ), version)
+
+async def afind_by_email(email: str) -> Optional[Users]:
+    user = _cache_get(f"email:{email}")
+    if user is not None:
+        return user
+
+    version = _cache_version()
+    return _cache_put(await async_database.execute_query(
+        sql=_FIND_BY_EMAIL_SQL,
+        values=(email,),
+        prepare=True
+    ), version)
+
+async def afind_by_username(username: str) -> Optional[Users]:
+    # username은 UNIQUE가 아니므로 캐시를 사용하지 않는다.
+    users = await async_database.execute_query(
+        sql=_FIND_BY_USERNAME_SQL,
+        values=(username,),
+        prepare=True
+    )
+    return Users(**users[0]) if users else None
+
+async def afind_all() -> Optional[list[Users]]:
+    users = await async_database.execute_query(
+        sql=_FIND_ALL_SQL
+    )
+    return [Users(**user) for user in users]
+
+async def afind_page(after_id: int = 0, limit: int = 100) -> list[Users]:
+    users = await async_database.execute_query(
+        sql=_FIND_PAGE_SQL,
+        values=(after_id, limit),
+        prepare=True
     )
     return [Users(**user) for user in users]
+
+async def astream_all(batch_size: int = 1000) -> AsyncIterator[Users]:
+    async for user in async_database.execute_stream(sql=_STREAM_ALL_SQL, batch_size=batch_size):
+        yield Users(**user)
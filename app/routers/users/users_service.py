@@ -1,15 +1,16 @@
-from typing import List
+from typing import AsyncIterator, Iterator, List
 
 from app.internal.exception.controlled_exception import ControlledException
 from app.internal.exception.errorcode import basic_error_code
 from app.internal.utils.optional_helper import or_else_throw
 from app.routers.users import users_repository
 from app.routers.users.users import Users
-from app.routers.users.users_dto import UsersDTO
+from app.routers.users.users_dto import UsersBulkResult, UsersDTO
+from config.common.common_cache import CacheStats
 
 
-def create(users_dto: UsersDTO) -> Users:
-    newUser = Users(
+def _to_users(users_dto: UsersDTO) -> Users:
+    return Users(
         id=users_dto.id,
         email=users_dto.email,
         password=users_dto.password,
@@ -18,31 +19,33 @@ def create(users_dto: UsersDTO) -> Users:
         updated_at=users_dto.updated_at
     )
 
+def create(users_dto: UsersDTO) -> Users:
+    newUser = _to_users(users_dto)
+
     return users_repository.insert_into(newUser)
 
+def bulk_create(users_dtos: List[UsersDTO], chunk_size: int) -> List[UsersBulkResult]:
+    return users_repository.bulk_insert_into([_to_users(users_dto) for users_dto in users_dtos], chunk_size)
+
+def bulk_upsert(users_dtos: List[UsersDTO], chunk_size: int) -> List[UsersBulkResult]:
+    return users_repository.bulk_upsert_into([_to_users(users_dto) for users_dto in users_dtos], chunk_size)
+
+def bulk_delete(ids: List[int], chunk_size: int) -> List[UsersBulkResult]:
+    return users_repository.bulk_delete_users(ids, chunk_size)
+
 def update(users_dto: UsersDTO) -> Users:
-    user = or_else_throw(
-        value=users_repository.find_by_id(users_dto.id),
+    # None인 항목은 repository에서 기존 값을 유지한다.
+    return or_else_throw(
+        value=users_repository.update_into(_to_users(users_dto)),
         error=ControlledException(basic_error_code.DATABASE_ERROR)
     )
 
-    if users_dto.email is not None:
-        user.email = users_dto.email
-    if users_dto.password is not None:
-        user.password = users_dto.password
-    if users_dto.username is not None:
-        user.username = users_dto.username
-
-    return users_repository.update_into(user)
-
 def delete(users_dto: UsersDTO) -> Users:
-    user = or_else_throw(
-        value=users_repository.find_by_id(users_dto.id),
+    return or_else_throw(
+        value=users_repository.delete_users(_to_users(users_dto)),
         error=ControlledException(basic_error_code.DATABASE_ERROR)
     )
 
-    return users_repository.delete_users(user)
-
 def find_by_id(user_id: int) -> Users:
     return or_else_throw(
         value=users_repository.find_by_id(user_id),
@@ -62,4 +65,70 @@ def find_by_username(username: str) -> Users:
     )
 
 def find_all() -> List[Users]:
-    return users_repository.find_all()
\ No newline at end of file
+    return users_repository.find_all()
+
+def find_page(after_id: int, limit: int) -> List[Users]:
+    return users_repository.find_page(after_id, limit)
+
+def stream_all(batch_size: int) -> Iterator[Users]:
+    return users_repository.stream_all(batch_size)
+
+def cache_stats() -> CacheStats:
+    return users_repository.cache_stats()
+
+"""
+Async
+users_repository의 비동기 함수를 사용하는 서비스 함수이다.
+"""
+async def acreate(users_dto: UsersDTO) -> Users:
+    newUser = _to_users(users_dto)
+
+    return await users_repository.ainsert_into(newUser)
+
+async def abulk_create(users_dtos: List[UsersDTO], chunk_size: int) -> List[UsersBulkResult]:
+    return await users_repository.abulk_insert_into([_to_users(users_dto) for users_dto in users_dtos], chunk_size)
+
+async def abulk_upsert(users_dtos: List[UsersDTO], chunk_size: int) -> List[UsersBulkResult]:
+    return await users_repository.abulk_upsert_into([_to_users(users_dto) for users_dto in users_dtos], chunk_size)
+
+async def abulk_delete(ids: List[int], chunk_size: int) -> List[UsersBulkResult]:
+    return await users_repository.abulk_delete_users(ids, chunk_size)
+
+async def aupdate(users_dto: UsersDTO) -> Users:
+    return or_else_throw(
+        value=await users_repository.aupdate_into(_to_users(users_dto)),
+        error=ControlledException(basic_error_code.DATABASE_ERROR)
+    )
+
+async def adelete(users_dto: UsersDTO) -> Users:
+    return or_else_throw(
+        value=await users_repository.adelete_users(_to_users(users_dto)),
+        error=ControlledException(basic_error_code.DATABASE_ERROR)
+    )
+
+async def afind_by_id(user_id: int) -> Users:
+    return or_else_throw(
+        value=await users_repository.afind_by_id(user_id),
+        error=ControlledException(basic_error_code.DATABASE_ERROR)
+    )
+
+async def afind_by_email(email: str) -> Users:
+    return or_else_throw(
+        value=await users_repository.afind_by_email(email),
+        error=ControlledException(basic_error_code.DATABASE_ERROR)
+    )
+
+async def afind_by_username(username: str) -> Users:
+    return or_else_throw(
+        value=await users_repository.afind_by_username(username),
+        error=ControlledException(basic_error_code.DATABASE_ERROR)
+    )
+
+async def afind_all() -> List[Users]:
+    return await users_repository.afind_all()
+
+async def afind_page(after_id: int, limit: int) -> List[Users]:
+    return await users_repository.afind_page(after_id, limit)
+
+def astream_all(batch_size: int) -> AsyncIterator[Users]:
+    return users_repository.astream_all(batch_size)
@@ -0,0 +1,101 @@
+"""
+요약:
+    임베딩 추론 백엔드(torch, int8, onnx)의 지연 시간, 메모리, 결과 일치도를 비교하는 벤치마크
+
+설명:
+    각 백엔드를 별도의 프로세스에서 실행하여
+    1) 처리량(texts/s)과 묶음 하나의 평균 지연 시간
+    2) 프로세스의 최대 RSS(작업 프로세스 하나가 차지하는 메모리)
+    3) torch 백엔드 결과와의 최소/평균 코사인 유사도를 측정한다.
+    최소 코사인 유사도가 --tolerance보다 낮은 백엔드가 있으면 종료 코드 1로 끝난다.
+
+실행:
+    python -m benchmark.embedding_backend_benchmark --backends torch int8 onnx --tolerance 0.98
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmark.embedding_bucketing_benchmark import build_corpus
+
+
+def run_backend(backend: str, corpus: list[str], rounds: int, threads: int) -> tuple[float, float, float, np.ndarray]:
+    """
+    작업 프로세스에서 하나의 백엔드로 말뭉치를 임베딩한다.
+
+    Returns:
+        (texts/s, 묶음 하나의 평균 지연 시간(ms), 최대 RSS(MB), 임베딩 행렬)
+    """
+    import torch
+
+    from config.models.embedding_model import EmbeddingModel
+
+    if threads:
+        torch.set_num_threads(threads)
+
+    # 캐시 적중이 측정에 섞이지 않도록 캐시를 끈다.
+    embedding_model = EmbeddingModel(cache_size=0, cache_dir=None, workers=0, backend=backend)
+    embedding_model.warmup()
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for index in range(0, len(corpus), 32):
+            batch_start = time.perf_counter()
+            embedding_model.embedding_matrix(corpus[index:index + 32], dtype=np.float32)
+            latencies.append(time.perf_counter() - batch_start)
+    elapsed = time.perf_counter() - start
+
+    embeddings = embedding_model.embedding_matrix(corpus, dtype=np.float32)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB
+    return len(corpus) * rounds / elapsed, sum(latencies) / len(latencies) * 1000, rss, embeddings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx"])
+    parser.add_argument("--texts", type=int, default=128)
+    parser.add_argument("--long-ratio", type=float, default=0.1)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=0.98)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.texts, args.long_ratio, args.seed)
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for backend in backends:
+        # 백엔드마다 새 프로세스에서 실행해야 최대 RSS가 서로 섞이지 않는다.
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                results[backend] = executor.submit(run_backend, backend, corpus, args.rounds, args.threads).result()
+            except ImportError as exception:
+                print(f"{backend:6}: skipped ({exception})")
+
+    print(f"texts={args.texts} long_ratio={args.long_ratio} rounds={args.rounds} threads={args.threads or 'default'}")
+    reference = results["torch"][3]
+    passed = True
+    for backend, (throughput, latency, rss, embeddings) in results.items():
+        # 모든 결과가 L2 정규화되어 있으므로 행별 내적이 코사인 유사도이다.
+        similarities = np.einsum("ij,ij->i", reference, embeddings)
+        passed &= bool(similarities.min() >= args.tolerance)
+        print(
+            f"{backend:6}: {throughput:10.2f} texts/s {latency:8.1f} ms/batch {rss:8.0f} MB RSS "
+            f"cosine min={similarities.min():.4f} mean={similarities.mean():.4f}"
+        )
+
+    if not passed:
+        print(f"cosine similarity below tolerance {args.tolerance}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
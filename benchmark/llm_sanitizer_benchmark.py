@@ -0,0 +1,75 @@
+"""
+요약:
+    LLM 출력 정제(<think> 블록, 코드펜스 제거) + JSON 파싱의 처리 시간을 측정하는 마이크로 벤치마크
+
+설명:
+    긴 <think> 블록 뒤에 JSON이 오는 추론 모델 출력을 만들어
+    1) 기존 방식: strip/startswith/endswith + 매번 컴파일되는 re.sub(DOTALL) + json.loads
+    2) 단일 탐색 방식: llm_output_parser.extract_json() + json.loads
+    3) 단일 탐색 방식 + orjson (설치되어 있는 경우)
+    을 비교하고, 세 방식의 결과가 같은지 확인한다.
+    <think> 블록 뒤에 코드펜스가 오는 출력은 기존 방식이 파싱하지 못하므로, 단일 탐색 방식으로만 확인한다.
+
+실행:
+    python -m benchmark.llm_sanitizer_benchmark --think-kb 64 --rounds 2000
+"""
+import argparse
+import json
+import re
+import timeit
+
+from config.llm import llm_output_parser
+
+PARAGRAPH = "사용자의 질문을 다시 읽어 보면, 점심 메뉴에 대한 이야기이므로 친근하게 대답해야 한다. {\"draft\": \"...\"} "
+
+
+def build_output(think_kb: int, fence: bool = False) -> str:
+    think = (PARAGRAPH * (think_kb * 1024 // len(PARAGRAPH.encode("utf-8")) + 1))
+    answer = json.dumps({"result": {"message": "점심으로 김치찌개를 먹었고 너무 매워서 물을 많이 마셨어. " * 4}}, ensure_ascii=False)
+    if fence:
+        answer = f"```json\n{answer}\n```"
+    return f"<think>\n{think}\n</think>\n\n{answer}"
+
+
+def legacy(text: str):
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[len("```json"):].strip()
+    if text.endswith("```"):
+        text = text[:-3].strip()
+    text = re.sub(r'<think>.*?</think>\s*', '', text, flags=re.DOTALL)
+    return json.loads(text.strip())
+
+
+def single_pass(text: str):
+    return json.loads(llm_output_parser.extract_json(text))
+
+
+def single_pass_orjson(text: str):
+    return llm_output_parser.orjson.loads(llm_output_parser.extract_json(text))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--think-kb", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    text = build_output(args.think_kb)
+    candidates = {"legacy": legacy, "single-pass": single_pass}
+    if llm_output_parser.orjson is not None:
+        candidates["single-pass+orjson"] = single_pass_orjson
+
+    expected = legacy(text)
+    assert single_pass(build_output(args.think_kb, fence=True)) == expected, "코드펜스가 있는 출력을 파싱하지 못했습니다."
+    print(f"output={len(text.encode('utf-8')) / 1024:.1f} KB rounds={args.rounds}")
+    baseline = None
+    for name, function in candidates.items():
+        assert function(text) == expected, f"{name}의 결과가 기존 방식과 다릅니다."
+        seconds = timeit.timeit(lambda: function(text), number=args.rounds) / args.rounds
+        baseline = baseline or seconds
+        print(f"{name:20}: {seconds * 1e6:10.1f} us/output ({baseline / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+요약:
+    유저 목록 조회(GET /users) 응답의 직렬화 방식별 처리량을 측정하는 벤치마크
+
+설명:
+    DB 조회 시간을 제외하기 위해 같은 유저 목록을 반환하는 두 경로를 만들어, ASGI 앱을 직접 호출한다.
+    1) 기존 방식: response_model=CommonResponse[list[Users]]로 CommonResponse를 반환 (검증 + jsonable_encoder + json.dumps)
+    2) 변경 방식: CommonJSONResponse(CommonResponse(...))를 반환 (pydantic-core로 한 번만 직렬화)
+    두 응답의 JSON이 같은지 확인한 뒤, 초당 처리 요청 수를 출력한다.
+
+실행:
+    python -m benchmark.response_serialization_benchmark --users 100 1000 --seconds 3
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+
+from app.routers.users.users import Users
+from config.common.common_response import CommonJSONResponse, CommonResponse
+
+
+def build_users(count: int) -> list[Users]:
+    now = datetime(2025, 1, 1, 9, 0, 0)
+    return [
+        Users(id=index, email=f"user{index}@example.com", password="x" * 60, username=f"유저{index}",
+              created_at=now + timedelta(seconds=index), updated_at=now + timedelta(seconds=index, microseconds=index))
+        for index in range(1, count + 1)
+    ]
+
+
+def build_app(users: list[Users]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy", response_model=CommonResponse[list[Users]])
+    async def legacy():
+        return CommonResponse(code=200, message="유저 전체 조회 성공", data=users)
+
+    @app.get("/fast", response_model=CommonResponse[list[Users]], response_class=CommonJSONResponse)
+    async def fast():
+        return CommonJSONResponse(CommonResponse(code=200, message="유저 전체 조회 성공", data=users))
+
+    return app
+
+
+async def request(app: FastAPI, path: str) -> bytes:
+    """
+    HTTP 서버 없이 ASGI 앱에 GET 요청을 보내고 응답 본문을 반환한다.
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"benchmark")], "client": ("127.0.0.1", 0), "server": ("benchmark", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def throughput(app: FastAPI, path: str, seconds: float) -> float:
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        await request(app, path)
+        count += 1
+    return count / elapsed
+
+
+async def run(counts: list[int], seconds: float):
+    for count in counts:
+        app = build_app(build_users(count))
+        legacy = await request(app, "/legacy")
+        fast = await request(app, "/fast")
+        assert json.loads(legacy) == json.loads(fast), "두 방식의 응답이 다릅니다."
+
+        before = await throughput(app, "/legacy", seconds)
+        after = await throughput(app, "/fast", seconds)
+        print(f"users={count:5} body={len(fast) / 1024:8.1f} KB "
+              f"legacy={before:9.1f} req/s fast={after:9.1f} req/s ({after / before:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="*", default=[1, 100, 1000])
+    parser.add_argument("--seconds", type=float, default=3.0, help="방식별 측정 시간(초)")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
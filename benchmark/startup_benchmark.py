@@ -0,0 +1,76 @@
+"""
+요약:
+    모듈 import 시간과 임베딩 모델 준비(ready) 시간을 측정하는 벤치마크
+
+설명:
+    각 측정은 새로운 파이썬 프로세스에서 수행하여, 이전 측정의 import 결과가 섞이지 않도록 한다.
+    - import: 모듈을 불러오는 데 걸린 시간과 최대 메모리(RSS)
+    - ready: 임베딩 모델 warmup()까지 걸린 시간과 최대 메모리(RSS)
+
+실행:
+    python -m benchmark.startup_benchmark
+    python -m benchmark.startup_benchmark --modules app.main
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = [
+    "config.models.embedding_model",
+    "config.database.milvus_database",
+    "config.common.common_llm",
+]
+
+IMPORT_SCRIPT = """
+import json, resource, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+READY_SCRIPT = """
+import json, resource, time
+start = time.perf_counter()
+from config.models.embedding_model import embedding_model
+imported = time.perf_counter()
+embedding_model.warmup()
+ready = time.perf_counter()
+print(json.dumps({"import_seconds": imported - start, "seconds": ready - start, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def run(script: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT, env=os.environ.copy(), capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--skip-ready", action="store_true", help="임베딩 모델 준비 시간 측정을 생략한다.")
+    args = parser.parse_args()
+
+    print(f"{'target':45} {'seconds(min)':>13} {'max_rss_mb':>11}")
+    for module in args.modules:
+        results = [run(IMPORT_SCRIPT.format(module=module)) for _ in range(args.rounds)]
+        best = min(results, key=lambda result: result["seconds"])
+        print(f"{'import ' + module:45} {best['seconds']:13.3f} {best['max_rss_mb']:11.1f}")
+
+    if not args.skip_ready:
+        results = [run(READY_SCRIPT) for _ in range(args.rounds)]
+        best = min(results, key=lambda result: result["seconds"])
+        print(f"{'ready embedding_model.warmup()':45} {best['seconds']:13.3f} {best['max_rss_mb']:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import copy
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from config.cache.memory_cache import MemoryCache
+from config.common.common_cache import CacheStats
+
+# LLM 응답 캐시 설정 (0이면 사용하지 않는다)
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1000"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "600"))
+# (선택) 의미 기반 캐시 설정 (항목 수가 0이면 사용하지 않는다)
+LLM_SEMANTIC_CACHE_SIZE = int(os.getenv("LLM_SEMANTIC_CACHE_SIZE", "0"))
+LLM_SEMANTIC_CACHE_THRESHOLD = float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+
+
+@dataclass(frozen=True)
+class LLMCacheStats:
+    """
+    LLM 응답 캐시의 사용 통계
+
+    Attributes:
+        exact_hits(int): 프롬프트가 완전히 같아 캐시된 응답을 반환한 횟수
+        semantic_hits(int): 질문이 유사하여 캐시된 응답을 반환한 횟수
+        misses(int): 캐시된 응답이 없어 LLM을 호출한 횟수
+        bypasses(int): 캐시를 사용하지 않도록 요청된 횟수
+        exact(CacheStats): 1차(완전 일치) 캐시의 통계
+        semantic_size(int): 2차(의미 기반) 캐시에 저장된 항목 수
+    """
+    exact_hits: int
+    semantic_hits: int
+    misses: int
+    bypasses: int
+    exact: Optional[CacheStats]
+    semantic_size: int
+
+
+class LLMResponseCache:
+    """
+    요약:
+        LLM 응답을 저장하는 2단계 캐시
+
+    설명:
+        1차 캐시는 (모델, temperature, 렌더링된 프롬프트)의 해시로 찾는 완전 일치 캐시(MemoryCache)이다.
+        2차 캐시는 질문 텍스트의 임베딩으로 찾는 의미 기반 캐시이다.
+            - 질문을 제외한 프롬프트(모델, temperature, 나머지 인자)가 같은 항목 중에서만 찾는다.
+            - 코사인 유사도가 semantic_threshold 이상인 가장 유사한 항목의 응답을 반환한다.
+            - 임베딩은 EmbeddingModel.embedding_matrix()로 만들며, 모델은 처음 사용할 때 불러온다.
+        두 캐시 모두 ttl이 지나면 만료되고, 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거된다.
+        반환 값은 캐시된 값의 복사본이다.
+
+    Attributes:
+        _exact(MemoryCache): 1차 캐시 *None이면 사용하지 않는다.
+        _ttl(float): 항목의 유효 시간(초)
+        _semantic_size(int): 2차 캐시의 최대 항목 수 *0이면 사용하지 않는다.
+        _semantic_threshold(float): 2차 캐시 적중으로 판단할 최소 코사인 유사도
+        _vectors(np.ndarray): 2차 캐시 질문 임베딩 (semantic_size, dim) *처음 저장 시 생성
+        _namespaces(np.ndarray): 2차 캐시 항목의 질문을 제외한 프롬프트 해시
+        _expires_at(np.ndarray): 2차 캐시 항목의 만료 시각 *0이면 빈 칸
+        _used_at(np.ndarray): 2차 캐시 항목의 마지막 사용 시각 (LRU)
+        _values(list): 2차 캐시 항목의 응답
+    """
+    def __init__(self, size: int = LLM_CACHE_SIZE, ttl: float = LLM_CACHE_TTL,
+                 semantic_size: int = LLM_SEMANTIC_CACHE_SIZE, semantic_threshold: float = LLM_SEMANTIC_CACHE_THRESHOLD):
+        self._exact = MemoryCache(max_size=size, ttl=ttl) if size > 0 else None
+        self._ttl = ttl
+        self._semantic_size = semantic_size
+        self._semantic_threshold = semantic_threshold
+
+        self._vectors: Optional[np.ndarray] = None
+        self._namespaces = np.zeros(semantic_size, dtype=np.int64)
+        self._expires_at = np.zeros(semantic_size, dtype=np.float64)
+        self._used_at = np.zeros(semantic_size, dtype=np.float64)
+        self._values: list[Any] = [None] * semantic_size
+        self._lock = threading.Lock()
+
+        self._exact_hits = 0
+        self._semantic_hits = 0
+        self._misses = 0
+        self._bypasses = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self._semantic_size > 0
+
+    @staticmethod
+    def key(*parts: Any) -> bytes:
+        """
+        캐시 key(SHA-256)를 만드는 함수
+        """
+        return hashlib.sha256("\0".join(map(str, parts)).encode("utf-8")).digest()
+
+    def get(self, key: bytes, namespace: Optional[bytes] = None, question: Optional[str] = None) -> Optional[Any]:
+        """
+        요약:
+            캐시된 응답을 반환하는 함수 *없다면 None
+
+        Parameters:
+            key(bytes): 렌더링된 프롬프트 전체의 key
+            namespace(bytes): 질문을 제외한 프롬프트의 key *2차 캐시에서만 사용
+            question(str): 질문 텍스트 *없다면 2차 캐시를 사용하지 않는다.
+        """
+        value = self._exact.get(key) if self._exact else None
+        if value is not None:
+            with self._lock:
+                self._exact_hits += 1
+            return copy.deepcopy(value)
+
+        if self.semantic_enabled and namespace is not None and question:
+            value = self._semantic_get(namespace, self._embed(question))
+            if value is not None:
+                with self._lock:
+                    self._semantic_hits += 1
+                # 같은 프롬프트의 다음 요청은 1차 캐시에서 찾도록 저장한다.
+                if self._exact:
+                    self._exact.set(key, value)
+                return copy.deepcopy(value)
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def set(self, key: bytes, value: Any, namespace: Optional[bytes] = None, question: Optional[str] = None):
+        """
+        응답을 캐시하는 함수 *인자는 get()과 같다.
+        """
+        value = copy.deepcopy(value)
+        if self._exact:
+            self._exact.set(key, value)
+        if self.semantic_enabled and namespace is not None and question:
+            self._semantic_set(namespace, self._embed(question), value)
+
+    def bypass(self):
+        """
+        캐시를 사용하지 않은 요청을 기록하는 함수
+        """
+        with self._lock:
+            self._bypasses += 1
+
+    def clear(self):
+        if self._exact:
+            self._exact.clear()
+        with self._lock:
+            self._expires_at[:] = 0
+            self._values = [None] * self._semantic_size
+
+    def stats(self) -> LLMCacheStats:
+        with self._lock:
+            return LLMCacheStats(
+                exact_hits=self._exact_hits,
+                semantic_hits=self._semantic_hits,
+                misses=self._misses,
+                bypasses=self._bypasses,
+                exact=self._exact.stats() if self._exact else None,
+                semantic_size=int(np.count_nonzero(self._expires_at > time.monotonic()))
+            )
+
+    @staticmethod
+    def _embed(question: str) -> np.ndarray:
+        # 임베딩 모델(torch)은 의미 기반 캐시를 사용할 때만 불러온다.
+        from config.models.embedding_model import embedding_model
+
+        return embedding_model.embedding_matrix([question], dtype=np.float32)[0]
+
+    @staticmethod
+    def _namespace_id(namespace: bytes) -> int:
+        return int.from_bytes(namespace[:8], "little", signed=True)
+
+    def _semantic_get(self, namespace: bytes, vector: np.ndarray) -> Optional[Any]:
+        with self._lock:
+            if self._vectors is None:
+                return None
+
+            now = time.monotonic()
+            candidates = np.flatnonzero((self._namespaces == self._namespace_id(namespace)) & (self._expires_at > now))
+            if not len(candidates):
+                return None
+
+            # 임베딩은 L2 정규화되어 있으므로 내적이 코사인 유사도이다.
+            similarities = self._vectors[candidates] @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self._semantic_threshold:
+                return None
+
+            slot = candidates[best]
+            self._used_at[slot] = now
+            return self._values[slot]
+
+    def _semantic_set(self, namespace: bytes, vector: np.ndarray, value: Any):
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self._semantic_size, len(vector)), dtype=np.float32)
+
+            # 빈 칸 또는 만료된 칸이 있다면 사용하고, 없다면 가장 오래 사용되지 않은 칸을 덮어쓴다.
+            now = time.monotonic()
+            free = np.flatnonzero(self._expires_at <= now)
+            slot = int(free[0]) if len(free) else int(np.argmin(self._used_at))
+
+            self._vectors[slot] = vector
+            self._namespaces[slot] = self._namespace_id(namespace)
+            self._expires_at[slot] = now + self._ttl
+            self._used_at[slot] = now
+            self._values[slot] = value
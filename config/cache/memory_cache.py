@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterable, Optional
+
+from config.common.common_cache import CacheStats, CommonCache
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    keys: tuple
+
+
+class MemoryCache(CommonCache):
+    """
+    요약:
+        TTL과 LRU 제거 정책을 가진 프로세스 내부 캐시
+
+    설명:
+        max_size를 넘으면 가장 오래 사용되지 않은 항목부터 제거한다.
+        ttl이 지난 항목은 조회 시점에 제거된다.
+        여러 스레드에서 동시에 사용할 수 있다.
+
+    Attributes:
+        _max_size(int): 저장할 최대 항목 수
+        _ttl(float): 항목의 유효 시간(초) *None이면 만료되지 않는다.
+        _entries(OrderedDict): 대표 key와 항목 (LRU 순서)
+        _keys(dict): 대표 key/별칭과 대표 key의 매핑
+    """
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = 60.0):
+        if max_size < 1:
+            raise ValueError(f"max_size는 1 이상이어야 합니다. (max_size={max_size})")
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._keys: dict[Hashable, Hashable] = {}
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            primary = self._keys.get(key)
+            entry = self._entries.get(primary) if primary is not None else None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(primary)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(primary)
+            self._hits += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, aliases: Iterable[Hashable] = ()) -> None:
+        keys = (key, *aliases)
+        expires_at = time.monotonic() + self._ttl if self._ttl is not None else float("inf")
+
+        with self._lock:
+            # 같은 key를 가진 기존 항목은 모두 제거한다. (별칭이 다른 항목으로 옮겨간 경우 포함)
+            for k in keys:
+                primary = self._keys.get(k)
+                if primary is not None:
+                    self._remove(primary)
+
+            self._entries[key] = _Entry(value=value, expires_at=expires_at, keys=keys)
+            for k in keys:
+                self._keys[k] = key
+
+            while len(self._entries) > self._max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            primary = self._keys.get(key)
+            if primary is not None:
+                self._remove(primary)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._entries)
+            )
+
+    def _remove(self, primary: Hashable):
+        entry = self._entries.pop(primary, None)
+        if entry is None:
+            return
+        for k in entry.keys:
+            if self._keys.get(k) == primary:
+                del self._keys[k]
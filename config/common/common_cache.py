@@ -0,0 +1,71 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterable, Optional
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    캐시의 사용 통계
+
+    Attributes:
+        hits(int): 캐시에서 값을 찾은 횟수
+        misses(int): 캐시에서 값을 찾지 못한 횟수 (만료 포함)
+        evictions(int): 용량 초과로 제거된 항목 수
+        expirations(int): TTL이 지나 제거된 항목 수
+        size(int): 현재 저장된 항목 수
+    """
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+
+class CommonCache(ABC):
+    """
+    프로젝트에서 캐시 구현을 위해 준수해야 할 필수 인터페이스
+
+    하나의 항목은 대표 key와 여러 개의 별칭(alias) key로 조회할 수 있으며,
+    어떤 key로 삭제하더라도 항목과 모든 key가 함께 제거됩니다.
+    프로세스 내부 캐시(MemoryCache) 대신 외부 캐시(Redis 등)를 사용하려면 이 인터페이스를 구현해주세요.
+    """
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        key(대표 key 또는 별칭)로 캐시된 값을 반환하는 함수입니다. 없다면 None을 반환합니다.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, aliases: Iterable[Hashable] = ()) -> None:
+        """
+        값을 캐시하는 함수입니다.
+
+        Parameters:
+            key(Hashable): 항목의 대표 key
+            value(Any): 캐시할 값
+            aliases(Iterable[Hashable]): 같은 항목을 가리키는 별칭 key
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """
+        key(대표 key 또는 별칭)가 가리키는 항목과 그 항목의 모든 key를 제거하는 함수입니다.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        모든 항목을 제거하는 함수입니다.
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """
+        캐시의 사용 통계를 반환하는 함수입니다.
+        """
+        pass
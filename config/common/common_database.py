@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
 
 class CommonDatabase(ABC):
     """
@@ -10,6 +11,8 @@ class CommonDatabase(ABC):
     def get_connection(self):
         """
         데이터베이스 Connection을 반환하는 함수입니다.
+
+        ConnectionPool을 사용하는 구현체는 with 블록에서 Connection을 빌려주고 반납하는 context manager로 구현합니다.
         """
         pass
 
@@ -17,6 +20,8 @@ class CommonDatabase(ABC):
     def get_cursor(self):
         """
         Connection의 Cursor를 반환하는 함수입니다.
+
+        ConnectionPool을 사용하는 구현체는 with 블록이 끝나면 Connection까지 반납하는 context manager로 구현합니다.
         """
         pass
 
@@ -32,12 +37,42 @@ class CommonDatabase(ABC):
         pass
 
     @abstractmethod
-    def execute_query(self, sql: str, values: tuple=()):
+    def execute_query(self, sql: str, values: tuple=(), prepare: bool=False):
         """
         select sql 구현에 사용하는 함수입니다.
 
         Parameters:
             sql(str): 구현할 SQL입니다.
             values(tuple): SQL에 포함될 데이터입니다.
+            prepare(bool): True라면 서버 측 prepared statement로 실행합니다. 자주 실행되는 고정 SQL에 사용해주세요.
+        """
+        pass
+
+    @abstractmethod
+    def execute_stream(self, sql: str, values: tuple=(), batch_size: int=1000):
+        """
+        결과가 큰 select sql을 한 행씩 순회하는 generator 함수입니다.
+
+        서버 측 cursor를 이용해 batch_size 만큼씩 가져오므로, 결과 크기와 관계없이 메모리 사용량이 일정합니다.
+
+        Parameters:
+            sql(str): 구현할 SQL입니다.
+            values(tuple): SQL에 포함될 데이터입니다.
+            batch_size(int): 서버에서 한 번에 가져올 행의 수입니다.
+        """
+        pass
+
+    @abstractmethod
+    def execute_batch(self, statements: Iterable[tuple[str, tuple]]) -> list[list]:
+        """
+        여러 sql을 하나의 트랜잭션으로 수행하는 함수입니다.
+
+        하나라도 실패하면 전체가 rollback 됩니다.
+
+        Parameters:
+            statements(Iterable[tuple[str, tuple]]): 순서대로 수행할 (sql, values) 묶음입니다.
+
+        Returns:
+            각 sql의 결과 행 (RETURNING 등 결과가 없다면 빈 리스트)
         """
         pass
\ No newline at end of file
@@ -1,30 +1,42 @@
+import asyncio
+import copy
 import json
 import os
-import re
-import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from functools import lru_cache
 from textwrap import dedent
-from typing import Any
-
-from langchain_ollama import ChatOllama
+from typing import Any, AsyncIterator
 
 from app.internal.exception.controlled_exception import ControlledException
 from app.internal.exception.errorcode import llm_error_code
 from app.internal.log.log import log
+from config.cache.llm_response_cache import LLMCacheStats, LLMResponseCache
+from config.llm import llm_output_parser
+from config.llm.llm_request_queue import LLMQueueStats, LLMRequestQueue
+from config.llm.llm_stream_parser import LLMStreamParser
 
 MODEL_VERSION = os.environ.get('MODEL_VERSION')
+# Ollama가 마지막 요청 이후 모델(과 KV 캐시)을 메모리에 유지할 시간 (예: 30m, -1이면 계속 유지)
+LLM_KEEP_ALIVE = os.environ.get('LLM_KEEP_ALIVE', '30m')
+
+@lru_cache(maxsize=1)
+def get_chat_model():
+    """
+    요약:
+        채팅을 생성하는 모델을 반환한다.
 
-"""
-요약:
-    채팅을 생성하는 모델이다.
+    설명:
+        MainLLM: 사용자에게 에고를 투영하여 알맞은 답변을 제공하는 모델이다.
+        import 시간을 줄이기 위해 langchain_ollama는 처음 호출될 때 불러온다.
+    """
+    from langchain_ollama import ChatOllama
 
-설명:
-    MainLLM: 사용자에게 에고를 투영하여 알맞은 답변을 제공하는 모델이다.
-"""
-chat_model = ChatOllama(
-    model=MODEL_VERSION,
-    temperature=0.7
-)
+    return ChatOllama(
+        model=MODEL_VERSION,
+        temperature=0.7,
+        keep_alive=int(LLM_KEEP_ALIVE) if LLM_KEEP_ALIVE.lstrip("-").isdigit() else LLM_KEEP_ALIVE
+    )
 
 
 class CommonLLM(ABC):
@@ -38,16 +50,22 @@ class CommonLLM(ABC):
             - _template(list): 각 prompt를 연결할 객체이다. 추가 TEMPLATE는 이 객체에 .append() 할 것
         _lock: 싱글턴을 구현하기 위한 동기화 Flag 객체입니다.
 
-        _common_model(ChatOllama): CommonModel이 사용하는 ollama 모델
-        _semaphore(Semaphore): Ollama 프로세스 수를 고정하기 위한 세마포
+        _common_model(): CommonModel이 사용하는 ollama 모델을 반환한다. (처음 호출 시 생성)
+        _queue(LLMRequestQueue): Ollama 동시 실행 수(LLM_MAX_CONCURRENCY)를 제한하는 우선순위 대기열
+        _cache(LLMResponseCache): invoke() 결과를 저장하는 2단계(완전 일치, 의미 기반) 응답 캐시
+        _SEMANTIC_CACHE_FIELD(str): 의미 기반 캐시에서 유사도를 비교할 인자 명 *None이면 완전 일치 캐시만 사용한다.
+        _STREAM_FIELD(str): astream()이 응답 JSON의 result에서 꺼내 스트리밍할 문자열 필드 명
 
         _COMMON_COMMAND_TEMPLATE(tuple): LLM System Prompt - 제어 메타 태그
             - /json: 반환 값을 json 문자열로 반환한다.
             - /no_think: Qwen3의 경우 chain_of_thought를 결과를 출력하지 않도록 함
         _COMMON_RESPONSE_TEMPLATE(tuple): LLM System Prompt - 반환값을 JSON으로 고정하기 위한 명령어
     """
-    _common_model = chat_model
-    _semaphore = threading.Semaphore(1)
+    _common_model = staticmethod(get_chat_model)
+    _queue = LLMRequestQueue()
+    _cache = LLMResponseCache()
+    _SEMANTIC_CACHE_FIELD: str | None = None
+    _STREAM_FIELD: str = "message"
 
     _COMMON_COMMAND_TEMPLATE = ("system", dedent("""
         /json
@@ -73,18 +91,276 @@ class CommonLLM(ABC):
         """
         pass
 
-    def invoke(self, parameter: dict) -> Any:
+    def invoke(self, parameter: dict, use_cache: bool = True, priority: int = 0) -> Any:
         """
-        LLM의 응답을 받는 함수입니다.
+        LLM의 응답을 받는 함수입니다. (동기)
 
-        Returns:
+        같은 프롬프트(또는 의미 기반 캐시를 사용한다면 유사한 질문)의 응답이 캐시되어 있다면 LLM을 호출하지 않습니다.
+
+        Parameters:
             parameter(dict): Template에 들어가야 할 인자 값
+            use_cache(bool): False라면 캐시를 조회/저장하지 않고 LLM을 호출한다. *default: True
+            priority(int): 대기열에서의 우선순위 (작을수록 먼저 실행된다) *default: 0
 
         Raises:
             FAILURE_JSON_PARSING: JSON Decoding 실패 시, 빈 딕셔너리 반환
+            LLM_QUEUE_FULL: 대기열이 가득 찬 경우
+            LLM_QUEUE_TIMEOUT: 대기 시간(LLM_QUEUE_TIMEOUT)을 넘긴 경우
+        """
+        return self._invoke_cached(parameter, self._prompt(parameter), use_cache, priority)
+
+    async def ainvoke(self, parameter: dict, use_cache: bool = True, priority: int = 0) -> Any:
+        """
+        LLM의 응답을 받는 함수입니다. (비동기)
+
+        모델의 ainvoke()를 사용하므로 생성 중에도 이벤트 루프를 막지 않습니다.
+        인자와 캐시, 대기열 동작은 invoke()와 같습니다.
+        """
+        return await self._ainvoke_cached(parameter, self._prompt(parameter), use_cache, priority)
+
+    def _invoke_cached(self, parameter: dict, prompt: Any, use_cache: bool, priority: int) -> Any:
+        """
+        렌더링된 프롬프트로 캐시를 조회하고, 없다면 LLM을 호출하여 캐시에 저장한다. (동기)
+        """
+        if not use_cache:
+            self._cache.bypass()
+            return self._invoke(parameter, prompt, priority)
+
+        key, namespace, question = self._cache_keys(parameter, prompt)
+        cached = self._cache.get(key, namespace, question)
+        if cached is not None:
+            return cached
+
+        result = self._invoke(parameter, prompt, priority)
+        self._cache.set(key, result, namespace, question)
+        return result
+
+    async def _ainvoke_cached(self, parameter: dict, prompt: Any, use_cache: bool, priority: int) -> Any:
+        """
+        렌더링된 프롬프트로 캐시를 조회하고, 없다면 LLM을 호출하여 캐시에 저장한다. (비동기)
+        """
+        if not use_cache:
+            self._cache.bypass()
+            return await self._ainvoke(parameter, prompt, priority)
+
+        key, namespace, question = self._cache_keys(parameter, prompt)
+        # 의미 기반 캐시는 질문을 임베딩하므로 스레드에서 조회한다.
+        if question is None:
+            cached = self._cache.get(key)
+        else:
+            cached = await asyncio.to_thread(self._cache.get, key, namespace, question)
+        if cached is not None:
+            return cached
+
+        result = await self._ainvoke(parameter, prompt, priority)
+        if question is None:
+            self._cache.set(key, result)
+        else:
+            await asyncio.to_thread(self._cache.set, key, result, namespace, question)
+        return result
+
+    def invoke_many(self, parameters: list[dict], use_cache: bool = True, priority: int = 0,
+                    return_exceptions: bool = False) -> list[Any]:
+        """
+        요약:
+            여러 요청의 LLM 응답을 동시에 받아 요청 순서대로 반환하는 함수 (동기)
+
+        설명:
+            요청은 LLM_MAX_CONCURRENCY개씩 동시에 Ollama로 전송되며, 대기열이 넘치지 않도록 그 이상은 보내지 않는다.
+            프롬프트는 요청마다 한 번만 렌더링하여 중복 제거, 캐시 key, 모델 입력에 함께 사용한다.
+            같은 프롬프트로 렌더링되는 요청은 한 번만 호출한다.
+            고정 인자는 프롬프트에 미리 채워져 있고 system prefix가 같으므로, Ollama가 prefix의 KV 캐시를 재사용한다.
+
+        Parameters:
+            parameters(list[dict]): 요청별 Template 인자 값
+            use_cache(bool), priority(int): invoke()와 같다.
+            return_exceptions(bool): True라면 실패한 요청의 자리에 예외를 담아 반환한다.
+                *default: False (첫 예외를 발생시키며, 아직 시작하지 않은 요청은 취소한다)
+        """
+        unique, positions = self._dedupe(parameters)
+        with ThreadPoolExecutor(max_workers=self._queue.max_concurrency, thread_name_prefix="llm-batch") as executor:
+            futures = [executor.submit(self._invoke_cached, parameter, prompt, use_cache, priority) for parameter, prompt in unique]
+            if not return_exceptions:
+                _, pending = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in pending:
+                    future.cancel()
+        results = []
+        for future in futures:
+            if future.cancelled():
+                continue  # 다른 요청이 실패하여 취소되었으므로, 아래에서 그 예외가 발생한다.
+            exception = future.exception()
+            if exception is not None and not return_exceptions:
+                raise exception
+            results.append(exception if exception is not None else future.result())
+        return [copy.deepcopy(results[position]) for position in positions]
+
+    async def ainvoke_many(self, parameters: list[dict], use_cache: bool = True, priority: int = 0,
+                           return_exceptions: bool = False) -> list[Any]:
+        """
+        요약:
+            여러 요청의 LLM 응답을 동시에 받아 요청 순서대로 반환하는 함수 (비동기)
+
+        설명:
+            인자와 동작은 invoke_many()와 같다.
+            요청 하나가 실패하면(return_exceptions=False) 나머지 요청을 취소하여 대기열 슬롯을 반납한다.
+        """
+        unique, positions = self._dedupe(parameters)
+        limit = asyncio.Semaphore(self._queue.max_concurrency)
+
+        async def run(parameter: dict, prompt: Any):
+            async with limit:
+                return await self._ainvoke_cached(parameter, prompt, use_cache, priority)
+
+        tasks = [asyncio.ensure_future(run(parameter, prompt)) for parameter, prompt in unique]
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            # 취소된 요청이 슬롯을 반납할 때까지 기다린다.
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [copy.deepcopy(results[position]) for position in positions]
+
+    def _dedupe(self, parameters: list[dict]) -> tuple[list[tuple[dict, Any]], list[int]]:
+        """
+        같은 프롬프트로 렌더링되는 요청을 합치고, ((합친 요청, 렌더링된 프롬프트), 요청별 합친 요청의 위치)를 반환한다.
+        """
+        unique = []
+        indexes: dict[str, int] = {}
+        positions = []
+        for parameter in parameters:
+            prompt = self._prompt(parameter)
+            text = self._prompt_text(parameter, prompt)
+            if text not in indexes:
+                indexes[text] = len(unique)
+                unique.append((parameter, prompt))
+            positions.append(indexes[text])
+        return unique, positions
+
+    async def astream(self, parameter: dict, use_cache: bool = True, priority: int = 0) -> AsyncIterator[str]:
+        """
+        요약:
+            LLM의 응답 중 result의 _STREAM_FIELD 값을 생성되는 대로 조각씩 반환하는 함수
+
+        설명:
+            체인의 토큰 스트림에서 <think> 블록과 코드펜스를 바로 제거하고, JSON 전체가 끝나기 전에 필드 값을 꺼낸다.
+            스트림이 끝나면 전체 응답을 invoke()와 같이 검증하여 캐시에 저장한다. (완전 일치 캐시만 사용)
+            캐시된 응답이 있다면 필드 값 전체를 한 번에 반환한다.
+
+        Parameters:
+            parameter(dict): Template에 들어가야 할 인자 값
+            use_cache(bool): False라면 캐시를 조회/저장하지 않는다. *default: True
+            priority(int): 대기열에서의 우선순위 (작을수록 먼저 실행된다) *default: 0
+
+        Raises:
+            FAILURE_JSON_PARSING: 스트림이 끝난 뒤 전체 응답의 JSON Decoding 실패 시
+        """
+        key = None
+        prompt = self._prompt(parameter)
+        if use_cache:
+            key = LLMResponseCache.key(*self._cache_prefix(), self._prompt_text(parameter, prompt))
+            cached = self._cache.get(key)
+            if isinstance(cached, dict) and isinstance(cached.get(self._STREAM_FIELD), str):
+                yield cached[self._STREAM_FIELD]
+                return
+        else:
+            self._cache.bypass()
+
+        parser = LLMStreamParser(self._STREAM_FIELD)
+        async with self._queue.aacquire(priority):
+            stream = self.get_chain().astream(parameter) if prompt is None else self._common_model().astream(prompt)
+            async for chunk in stream:
+                delta = parser.feed(chunk.content)
+                if delta:
+                    yield delta
+            delta = parser.flush()
+            if delta:
+                yield delta
+
+        result = self._parse(parser.text)
+        if key is not None:
+            self._cache.set(key, result)
+
+    @classmethod
+    def cache_stats(cls) -> LLMCacheStats:
+        """
+        LLM 응답 캐시의 사용 통계를 반환하는 함수
+        """
+        return cls._cache.stats()
+
+    @classmethod
+    def queue_stats(cls) -> LLMQueueStats:
+        """
+        LLM 요청 대기열의 사용 통계(실행/대기 수, 대기 시간, 거절 수)를 반환하는 함수
+        """
+        return cls._queue.stats()
+
+    def _cache_keys(self, parameter: dict, prompt: Any) -> tuple[bytes, bytes | None, str | None]:
+        """
+        (프롬프트 전체의 key, 질문을 제외한 프롬프트의 key, 질문)을 반환한다.
+
+        key에는 클래스, 모델 명, temperature와 렌더링된 프롬프트가 포함된다.
+        질문을 제외한 프롬프트는 의미 기반 캐시를 사용할 때만 렌더링한다.
+        """
+        prefix = self._cache_prefix()
+        key = LLMResponseCache.key(*prefix, self._prompt_text(parameter, prompt))
+
+        field = self._SEMANTIC_CACHE_FIELD
+        if not self._cache.semantic_enabled or field is None or field not in parameter:
+            return key, None, None
+        blank = {**parameter, field: ""}
+        namespace = LLMResponseCache.key(*prefix, self._prompt_text(blank, self._prompt(blank)))
+        return key, namespace, str(parameter[field])
+
+    def _cache_prefix(self) -> tuple:
+        model = self._common_model()
+        return self.__class__.__name__, getattr(model, "model", None), getattr(model, "temperature", None)
+
+    def _prompt(self, parameter: dict) -> Any:
+        """
+        체인의 프롬프트 템플릿으로 프롬프트(PromptValue)를 렌더링한다. *템플릿이 없다면 None
+
+        렌더링된 프롬프트는 캐시 key와 모델 입력에 함께 사용하여, 요청마다 한 번만 렌더링한다.
+        """
+        template = getattr(self.get_chain(), "first", None)
+        return None if template is None else template.invoke(parameter)
+
+    @staticmethod
+    def _prompt_text(parameter: dict, prompt: Any) -> str:
+        """
+        렌더링된 프롬프트의 문자열을 반환한다. *프롬프트가 없다면 인자를 직렬화한다.
+        """
+        if prompt is None:
+            return json.dumps(parameter, ensure_ascii=False, sort_keys=True, default=str)
+        return prompt.to_string()
+
+    def _invoke(self, parameter: dict, prompt: Any, priority: int = 0) -> Any:
+        """
+        캐시를 거치지 않고 LLM을 호출하여 응답의 result를 반환한다. (동기)
+        """
+        with self._queue.acquire(priority):
+            if prompt is None:
+                answer: str = self.get_chain().invoke(parameter).content
+            else:
+                answer: str = self._common_model().invoke(prompt).content
+        return self._parse(answer)
+
+    async def _ainvoke(self, parameter: dict, prompt: Any, priority: int = 0) -> Any:
+        """
+        캐시를 거치지 않고 LLM을 호출하여 응답의 result를 반환한다. (비동기)
+        """
+        async with self._queue.aacquire(priority):
+            if prompt is None:
+                answer: str = (await self.get_chain().ainvoke(parameter)).content
+            else:
+                answer: str = (await self._common_model().ainvoke(prompt)).content
+        return self._parse(answer)
+
+    def _parse(self, answer: str) -> Any:
+        """
+        LLM의 응답 문자열을 정제하고, JSON의 result를 반환한다.
         """
-        with self._semaphore:
-            answer: str = self.get_chain().invoke(parameter).content
         clean_answer: str = self.clean_json_string(text=answer)
 
         # LOG. 사연용 로그
@@ -92,18 +368,21 @@ class CommonLLM(ABC):
 
         # 반환된 문자열 dict로 변환
         try:
-            return json.loads(clean_answer)["result"]
+            return llm_output_parser.loads(clean_answer)["result"]
         except json.JSONDecodeError:
             raise ControlledException(llm_error_code.JSON_PARSING_ERROR)
-        except KeyError:
+        except (KeyError, TypeError):
             raise ControlledException(llm_error_code.INVALID_DATA_TYPE)
 
     @staticmethod
     def clean_json_string(text: str) -> str:
         """
         요약:
-            LLM이 출력한 문자열에서 \`\`\`json, \`\`\` 마커와
-            <think> ... </think> 블록을 제거하고 양쪽 공백을 정리한다.
+            LLM이 출력한 문자열에서 <think> ... </think> 블록을 제외한 첫 번째 JSON 객체를 꺼낸다.
+
+        설명:
+            미리 컴파일한 정규식으로 한 번만 훑으므로, \`\`\`json, \`\`\` 마커나 설명 문장이 어디에 있어도 객체만 남는다.
+            JSON 객체가 없다면 <think> 블록과 마커만 제거한 텍스트를 반환한다.
 
         Parameters:
             text(str): 정제할 텍스트
@@ -111,16 +390,4 @@ class CommonLLM(ABC):
         Returns:
             Filtered Text
         """
-        # 양쪽 공백 제거
-        text = text.strip()
-
-        # 코드펜스 ```json ... ``` 제거
-        if text.startswith("```json"):
-            text = text[len("```json"):].strip()
-        if text.endswith("```"):
-            text = text[:-3].strip()
-
-        # <think> ... </think> 블록 제거 (여러 개 가능)
-        text = re.sub(r'<think>.*?</think>\s*', '', text, flags=re.DOTALL)
-
-        return text.strip()
\ No newline at end of file
+        return llm_output_parser.extract_json(text)
\ No newline at end of file
@@ -1,6 +1,12 @@
-from typing import Generic, Optional, TypeVar
+from typing import Any, Generic, Optional, TypeVar
 
 from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson은 선택 의존성이다.
+    orjson = None
 
 # Generic Class를 생성한다.
 T = TypeVar('T')
@@ -16,4 +22,26 @@ class CommonResponse(BaseModel, Generic[T]):
     """
     code: int
     message: str
-    data: Optional[T] = None
\ No newline at end of file
+    data: Optional[T] = None
+
+
+class CommonJSONResponse(JSONResponse):
+    """
+    요약:
+        CommonResponse를 한 번만 직렬화하여 JSON bytes로 전달하는 Response 클래스
+
+    설명:
+        response_model을 사용하면 FastAPI는 반환 값을 다시 검증하고, jsonable_encoder로 dict를 만든 뒤 json.dumps로 직렬화한다.
+        이 클래스를 반환하면 검증을 건너뛰고, pydantic-core의 직렬화기로 모델을 바로 bytes로 만든다. (model_dump_json()과 같은 결과)
+        pydantic 모델이 아닌 값은 orjson(설치된 경우) 또는 json으로 직렬화한다.
+        response_model은 OpenAPI 문서에만 사용된다.
+
+    Example:
+        return CommonJSONResponse(CommonResponse(code=200, message="유저 조회 성공", data=user))
+    """
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        if orjson is not None:
+            return orjson.dumps(content)
+        return super().render(content)
@@ -0,0 +1,171 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from app.internal.exception.controlled_exception import ControlledException
+from app.internal.exception.errorcode import basic_error_code
+from config.common.singleton import Singleton
+from config.database.milvus_database import MilvusDatabase, SearchHit
+
+# 비동기 Milvus 설정 (클라이언트 수 = 동시에 실행할 최대 요청 수, 요청 대기+실행 제한 시간(초))
+MILVUS_POOL_SIZE = int(os.getenv("MILVUS_POOL_SIZE", "4"))
+MILVUS_TIMEOUT = float(os.getenv("MILVUS_TIMEOUT", "30"))
+
+
+class _PooledMilvusDatabase(MilvusDatabase):
+    """
+    클라이언트 풀의 MilvusClient 하나를 사용하는 MilvusDatabase
+
+    싱글턴이 아니며, MilvusDatabase의 DDL/DML/Partition 함수를 주어진 클라이언트로 수행한다.
+    """
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self):
+        self._client = self._init_connection()
+
+    def get_connection(self):
+        return self._client
+
+    def close(self):
+        self._client.close()
+
+
+class AsyncMilvusDatabase(metaclass=Singleton):
+    """
+    요약:
+        Milvus를 비동기로 이용하기 위한 클래스
+
+    설명:
+        MilvusClient는 동기 클라이언트이므로, pool_size개의 클라이언트를 만들어 전용 스레드에서 실행한다.
+        요청은 빈 클라이언트를 기다렸다가(동시 실행 제한) 실행되며, 대기와 실행을 합쳐 timeout을 넘으면
+        ControlledException(VECTOR_DATABASE_TIMEOUT)을 발생시킨다.
+        이벤트 루프를 막지 않으므로 한 요청 안에서 벡터 I/O를 PostgreSQL, LLM 호출과 겹쳐 수행할 수 있다.
+        함수의 인자와 반환 형식은 MilvusDatabase와 같다.
+
+    Attributes:
+        _pool_size(int): 클라이언트 수
+        _timeout(float): 요청 하나의 대기+실행 제한 시간(초)
+        _databases(list[_PooledMilvusDatabase]): 클라이언트 풀
+        _idle(asyncio.Queue): 사용 가능한 클라이언트 *처음 요청 시 생성
+        _executor(ThreadPoolExecutor): 동기 클라이언트를 실행할 스레드
+    """
+    def __init__(self, pool_size: int = MILVUS_POOL_SIZE, timeout: float = MILVUS_TIMEOUT):
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._databases: list[_PooledMilvusDatabase] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="milvus")
+
+    async def open(self):
+        """
+        클라이언트 풀을 생성하는 함수
+
+        이벤트 루프 밖에서 생성될 수 있으므로, 큐와 클라이언트는 처음 요청(또는 open()) 시 만든다.
+        """
+        if self._idle is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        databases = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _PooledMilvusDatabase) for _ in range(self._pool_size)
+        ))
+        if self._idle is not None:
+            for database in databases:
+                database.close()
+            return
+
+        self._databases = list(databases)
+        self._idle = asyncio.Queue()
+        for database in self._databases:
+            self._idle.put_nowait(database)
+
+    async def close(self):
+        """
+        실행 중인 호출이 끝나기를 기다린 뒤, 클라이언트 풀을 닫는 함수
+        """
+        # 실행 중인 호출이 닫힌 클라이언트를 사용하지 않도록 먼저 끝나기를 기다린다. (이벤트 루프를 막지 않도록 스레드에서 기다린다)
+        await asyncio.to_thread(self._executor.shutdown, wait=True)
+        # 모든 호출이 끝난 뒤에 풀을 읽으므로, 반납 중인 클라이언트도 함께 닫힌다.
+        databases, self._databases, self._idle = self._databases, [], None
+        for database in databases:
+            database.close()
+        self.__class__.reset_instance()
+
+    async def _run(self, name: str, *args, **kwargs):
+        """
+        빈 클라이언트에서 MilvusDatabase의 함수를 실행하고 결과를 반환한다.
+
+        제한 시간을 넘어도 실행 중인 호출은 중단되지 않으며, 호출이 끝난 뒤 클라이언트가 풀에 반납된다.
+        """
+        await self.open()
+        idle = self._idle
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._timeout
+
+        try:
+            database = await asyncio.wait_for(idle.get(), self._timeout)
+        except asyncio.TimeoutError:
+            raise ControlledException(basic_error_code.VECTOR_DATABASE_TIMEOUT)
+
+        future = loop.run_in_executor(self._executor, lambda: getattr(database, name)(*args, **kwargs))
+        future.add_done_callback(lambda _: idle.put_nowait(database))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            raise ControlledException(basic_error_code.VECTOR_DATABASE_TIMEOUT)
+
+    """
+    DDL
+    """
+    async def create_collection(self, *args, **kwargs):
+        return await self._run("create_collection", *args, **kwargs)
+
+    async def drop_collection(self, *args, **kwargs):
+        return await self._run("drop_collection", *args, **kwargs)
+
+    async def has_collection(self, *args, **kwargs):
+        return await self._run("has_collection", *args, **kwargs)
+
+    """
+    DML
+    """
+    async def select_all(self, *args, **kwargs):
+        return await self._run("select_all", *args, **kwargs)
+
+    async def select_passages_to_ids(self, *args, **kwargs):
+        return await self._run("select_passages_to_ids", *args, **kwargs)
+
+    async def range_select(self, *args, **kwargs):
+        return await self._run("range_select", *args, **kwargs)
+
+    async def search(self, *args, **kwargs) -> list[list[SearchHit]]:
+        return await self._run("search", *args, **kwargs)
+
+    async def insert(self, *args, **kwargs):
+        return await self._run("insert", *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        return await self._run("delete", *args, **kwargs)
+
+    """
+    Partition
+    """
+    async def create_partition(self, *args, **kwargs):
+        return await self._run("create_partition", *args, **kwargs)
+
+    async def drop_partition(self, *args, **kwargs):
+        return await self._run("drop_partition", *args, **kwargs)
+
+    async def has_partition(self, *args, **kwargs):
+        return await self._run("has_partition", *args, **kwargs)
+
+    async def load_partitions(self, *args, **kwargs):
+        return await self._run("load_partitions", *args, **kwargs)
+
+    async def get_load_state(self, *args, **kwargs):
+        return await self._run("get_load_state", *args, **kwargs)
+
+    async def release_partitions(self, *args, **kwargs):
+        return await self._run("release_partitions", *args, **kwargs)
@@ -0,0 +1,119 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable
+from uuid import uuid4
+
+from psycopg import DatabaseError
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+from app.internal.exception.controlled_exception import ControlledException
+from app.internal.exception.errorcode import basic_error_code
+from config.common.common_async_database import CommonAsyncDatabase
+from config.common.singleton import Singleton
+from config.database.postgres_database import (
+    POSTGRES_DATABASE,
+    POSTGRES_HOST,
+    POSTGRES_PASSWORD,
+    POSTGRES_POOL_MAX_SIZE,
+    POSTGRES_POOL_MIN_SIZE,
+    POSTGRES_POOL_TIMEOUT,
+    POSTGRES_PORT,
+    POSTGRES_PREPARED_MAX_PER_CONNECTION,
+    POSTGRES_USER,
+)
+
+
+class AsyncPostgresDatabase(CommonAsyncDatabase, metaclass=Singleton):
+    """
+    PostgreSQL을 비동기로 이용하기 위한 클래스
+
+    psycopg(3)의 AsyncConnectionPool을 이용한 CommonAsyncDatabase 구현체
+    SQL 문법(%s placeholder)과 반환 형식(dict row)은 PostgresDatabase와 같다.
+    prepared statement는 psycopg의 Connection별 캐시(prepare_threshold, prepared_max)를 사용한다.
+    """
+    _pool: AsyncConnectionPool = None
+
+    def __init__(self, host=POSTGRES_HOST, database=POSTGRES_DATABASE, user=POSTGRES_USER, password=POSTGRES_PASSWORD, port=POSTGRES_PORT,
+                 min_size=POSTGRES_POOL_MIN_SIZE, max_size=POSTGRES_POOL_MAX_SIZE, timeout=POSTGRES_POOL_TIMEOUT,
+                 prepared_max_per_connection=POSTGRES_PREPARED_MAX_PER_CONNECTION):
+        async def configure(connection):
+            connection.prepared_max = prepared_max_per_connection
+
+        # 이벤트 루프 밖에서 생성될 수 있으므로, Pool은 open()을 호출할 때 연결한다.
+        self._pool = AsyncConnectionPool(
+            conninfo=make_conninfo(host=host, dbname=database, user=user, password=password, port=port),
+            min_size=min_size,
+            max_size=max_size,
+            timeout=timeout,
+            kwargs={"row_factory": dict_row},
+            configure=configure,
+            check=AsyncConnectionPool.check_connection,
+            open=False
+        )
+
+    async def open(self):
+        if self._pool.closed:
+            await self._pool.open()
+
+    async def close(self):
+        await self._pool.close()
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """
+        ConnectionPool에서 Connection을 빌려주고, async with 블록이 끝나면 반납한다.
+
+        블록이 정상 종료되면 commit, 예외가 발생하면 rollback 된다.
+        """
+        await self.open()
+        try:
+            async with self._pool.connection() as connection:
+                yield connection
+        except PoolTimeout:
+            raise ControlledException(basic_error_code.DATABASE_POOL_TIMEOUT)
+
+    @asynccontextmanager
+    async def get_cursor(self):
+        async with self.get_connection() as connection:
+            async with connection.cursor() as cursor:
+                yield cursor
+
+    async def execute_update(self, sql: str, values: tuple=()):
+        try:
+            async with self.get_cursor() as cursor:
+                await cursor.execute(sql, values)
+        except DatabaseError:
+            raise ControlledException(basic_error_code.DATABASE_ERROR)
+
+    async def execute_query(self, sql: str, values: tuple=(), prepare: bool=False):
+        try:
+            async with self.get_cursor() as cursor:
+                # prepare가 False라면 psycopg의 기본 정책(prepare_threshold)을 따른다.
+                await cursor.execute(sql, values, prepare=True if prepare else None)
+                return await cursor.fetchall()
+        except DatabaseError:
+            raise ControlledException(basic_error_code.DATABASE_ERROR)
+
+    async def execute_batch(self, statements: Iterable[tuple[str, tuple]]) -> list[list]:
+        try:
+            results = []
+            async with self.get_cursor() as cursor:
+                for sql, values in statements:
+                    await cursor.execute(sql, values)
+                    results.append(await cursor.fetchall() if cursor.description else [])
+            return results
+        except DatabaseError:
+            raise ControlledException(basic_error_code.DATABASE_ERROR)
+
+    async def execute_stream(self, sql: str, values: tuple=(), batch_size: int=1000) -> AsyncIterator[dict]:
+        try:
+            async with self.get_connection() as connection:
+                # 이름을 가진 cursor는 PostgreSQL 서버 측 cursor로 생성된다.
+                async with connection.cursor(name=f"stream_{uuid4().hex}") as cursor:
+                    cursor.itersize = batch_size
+                    await cursor.execute(sql, values)
+                    async for row in cursor:
+                        yield row
+        except DatabaseError:
+            raise ControlledException(basic_error_code.DATABASE_ERROR)
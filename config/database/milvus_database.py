@@ -1,6 +1,9 @@
 import os
 import threading
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
 
+import numpy as np
 from numpy import ndarray
 from pymilvus import CollectionSchema, MilvusClient
 from pymilvus.milvus_client import IndexParams
@@ -10,10 +13,23 @@ from config.models.embedding_model import embedding_model
 # .env 환경 변수 추출
 MILVUS_URI = os.getenv('MILVUS_URI')
 
-"""
-임베딩 모델의 최대 차원 수를 명시한 상수이다. 
-"""
-embedding_dim = len(embedding_model.embedding(["임베딩 모델 차원 수 측정용"])[0])
+# 값이 클수록 유사한 metric (나머지(L2 등)는 값이 작을수록 유사하다)
+_SIMILARITY_METRICS = {"COSINE", "IP"}
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    """
+    벡터 검색 결과 하나
+
+    Attributes:
+        id(Any): 레코드의 primary key
+        score(float): 질의 벡터와의 거리(metric 값)
+        entity(dict): output_fields로 요청한 필드 값
+    """
+    id: Any
+    score: float
+    entity: dict[str, Any]
 
 class MilvusDatabase:
     """
@@ -84,7 +100,7 @@ class MilvusDatabase:
             collection_name=collection_name,
             schema=schema,
             index_params=index_params,
-            dimension=embedding_dim
+            dimension=embedding_model.dimension  # 모델을 불러오지 않고 모델 설정에서 차원 수를 읽는다.
         )
 
     def drop_collection(self, collection_name:str):
@@ -114,6 +130,8 @@ class MilvusDatabase:
         """
         콜렉션 레코드를 전체 조회하는 함수
 
+        결과를 한 번에 반환하므로, 큰 콜렉션은 select_batches()/select_iter()를 사용할 것
+
         Parameters:
             collection_name(str): 조회할 콜렉션 명
             partition_names(list[str]): 조회할 파티션 묶음
@@ -127,6 +145,47 @@ class MilvusDatabase:
             filter=filter
         )
 
+    def select_batches(self, collection_name: str, partition_names: list[str], output_fields: list[str],
+                       filter: str = "", batch_size: int = 1000, limit: int = -1) -> Iterator[list[dict]]:
+        """
+        요약:
+            콜렉션 레코드를 batch_size개씩 나누어 조회하는 generator 함수
+
+        설명:
+            MilvusClient.query_iterator()로 primary key 순서대로 다음 묶음을 요청하므로,
+            서버의 결과 수 제한(16384)을 넘는 파티션도 일정한 메모리로 끝까지 조회할 수 있다.
+            generator를 끝까지 소비하지 않아도 iterator는 닫힌다.
+
+        Parameters:
+            collection_name(str): 조회할 콜렉션 명
+            partition_names(list[str]): 조회할 파티션 묶음
+            output_fields(list[str]): 반환받고 싶은 field 명
+            filter(str): 조회 조건 *default: 전체
+            batch_size(int): 한 번에 받아올 레코드 수
+            limit(int): 최대 레코드 수 *default: -1 (제한 없음)
+        """
+        iterator = self.get_connection().query_iterator(
+            collection_name=collection_name,
+            partition_names=partition_names,
+            output_fields=output_fields,
+            filter=filter,
+            batch_size=batch_size,
+            limit=limit
+        )
+        try:
+            while batch := iterator.next():
+                yield batch
+        finally:
+            iterator.close()
+
+    def select_iter(self, collection_name: str, partition_names: list[str], output_fields: list[str],
+                    filter: str = "", batch_size: int = 1000, limit: int = -1) -> Iterator[dict]:
+        """
+        콜렉션 레코드를 하나씩 반환하는 generator 함수 *select_batches()의 레코드 단위 버전
+        """
+        for batch in self.select_batches(collection_name, partition_names, output_fields, filter, batch_size, limit):
+            yield from batch
+
     def select_passages_to_ids(self, collection_name: str, partition_names: list[str], output_fields: list[str], ids: int|list[int]):
         """
         콜렉션 레코드를 id를 통해 조회하는 함수
@@ -155,6 +214,7 @@ class MilvusDatabase:
             output_fields(list[str]): 반환받고 싶은 field 명
             search_field(str): 인접 벡터를 구할 벡터 필드
             data(ndarray|list[ndarray]): 인접 벡터를 구할 기준 벡터(임베딩 텍스트)
+                - (dim,) 벡터, (n, dim) 행렬(EmbeddingModel.embedding_matrix()), 벡터 리스트 모두 가능
             radius(float): 레코드 유사도 범위(높을수록 유사한 것 *0.0~1.0)
         """
         return self.get_connection().search(
@@ -168,10 +228,69 @@ class MilvusDatabase:
                 }
             },
             anns_field=search_field,
-            data=data
+            data=self._as_vectors(data)
         )
 
-    def insert(self, collection_name:str, partition_name:str, data:dict|list[dict]):
+    def search(self, collection_name: str, search_field: str, partition_names: list[str], output_fields: list[str],
+               queries: list[str]|ndarray|list[ndarray], limit: int = 10, filter: str = "",
+               radius: Optional[float] = None, range_filter: Optional[float] = None, metric_type: str = "COSINE",
+               score_threshold: Optional[float] = None, dedup_field: Optional[str] = None,
+               params: Optional[dict] = None) -> list[list[SearchHit]]:
+        """
+        요약:
+            여러 질의를 한 번의 search 호출로 검색하고, 질의별 결과를 SearchHit 리스트로 반환하는 함수
+
+        설명:
+            질의가 텍스트라면 EmbeddingModel.embedding_matrix()로 한 번에 임베딩한다.
+            결과는 질의 순서대로, 각 질의 안에서는 유사한 순서대로 정렬되어 있다.
+
+        Parameters:
+            collection_name(str): 조회할 콜렉션 명
+            search_field(str): 인접 벡터를 구할 벡터 필드
+            partition_names(list[str]): 조회할 파티션 묶음
+            output_fields(list[str]): 반환받고 싶은 field 명
+            queries(list[str]|ndarray|list[ndarray]): 질의 텍스트 리스트 또는 질의 벡터((n, dim) 행렬, 벡터 리스트)
+            limit(int): 질의마다 반환할 최대 결과 수 (top-k)
+            filter(str): 스칼라 필드 조건식 (예: "persona_id == 3")
+            radius(float): 범위 검색의 바깥 경계 *COSINE이라면 이 값보다 유사한 결과만 반환한다.
+            range_filter(float): 범위 검색의 안쪽 경계 *COSINE이라면 이 값 이하로 유사한 결과만 반환한다.
+            metric_type(str): 콜렉션 인덱스의 metric (COSINE, IP, L2)
+            score_threshold(float): 이 값보다 유사하지 않은 결과를 버린다. *radius와 달리 검색 후에 적용된다.
+            dedup_field(str): 같은 값을 가진 결과 중 가장 유사한 하나만 남길 entity 필드 명 (예: 문서 id)
+                - 중복을 제거해도 limit개를 채울 수 있도록 limit의 2배를 검색한다.
+            params(dict): 인덱스별 검색 파라미터 (예: {"ef": 64})
+        """
+        if isinstance(queries, list) and queries and isinstance(queries[0], str):
+            queries = embedding_model.embedding_matrix(queries, dtype=np.float32)
+        vectors = self._as_vectors(queries)
+        if not vectors:
+            return []
+
+        search_params = {"metric_type": metric_type, "params": dict(params or {})}
+        if radius is not None:
+            search_params["params"]["radius"] = radius
+        if range_filter is not None:
+            search_params["params"]["range_filter"] = range_filter
+
+        results = self.get_connection().search(
+            collection_name=collection_name,
+            partition_names=partition_names,
+            output_fields=output_fields,
+            search_params=search_params,
+            anns_field=search_field,
+            data=vectors,
+            filter=filter,
+            limit=limit * 2 if dedup_field else limit
+        )
+
+        higher_is_better = metric_type.upper() in _SIMILARITY_METRICS
+        return [
+            self._to_hits(hits, limit, score_threshold, dedup_field, higher_is_better)
+            for hits in results
+        ]
+
+    def insert(self, collection_name:str, partition_name:str, data:dict|list[dict],
+               vectors: ndarray|None = None, vector_field: str|None = None):
         """
         콜렉션 레코드를 추가하는 함수
 
@@ -179,7 +298,16 @@ class MilvusDatabase:
             collection_name(str): 조회할 콜렉션 명
             partition_name(str): 조회할 파티션 묶음
             data(dict|list[dict]): 인접 벡터를 구할 기준 벡터(임베딩 텍스트)
+            vectors(ndarray): data의 각 레코드에 넣을 (n, dim) 벡터 행렬 *default: None
+                - EmbeddingModel.embedding_matrix()의 행을 복사 없이 vector_field에 넣는다. (전달한 data는 수정하지 않는다)
+            vector_field(str): vectors를 넣을 벡터 필드 명
         """
+        if vectors is not None:
+            data = [data] if isinstance(data, dict) else data
+            if vector_field is None or len(data) != len(vectors):
+                raise ValueError("vectors는 vector_field와 함께, data와 같은 개수로 전달해야 합니다.")
+            data = [{**record, vector_field: vector} for record, vector in zip(data, vectors)]
+
         return self.get_connection().insert(
             collection_name=collection_name,
             partition_name=partition_name,
@@ -283,4 +411,40 @@ class MilvusDatabase:
         return self.get_connection().release_partitions(
             collection_name=collection_name,
             partition_names=partition_names
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def _to_hits(hits: list[dict], limit: int, score_threshold: Optional[float],
+                 dedup_field: Optional[str], higher_is_better: bool) -> list[SearchHit]:
+        """
+        질의 하나의 검색 결과를 임계값과 중복 제거를 적용한 SearchHit 리스트로 바꾼다.
+        """
+        results = []
+        seen = set()
+        for hit in hits:
+            score = hit["distance"]
+            if score_threshold is not None and (score < score_threshold if higher_is_better else score > score_threshold):
+                continue
+
+            entity = hit.get("entity") or {}
+            if dedup_field is not None:
+                key = entity.get(dedup_field, hit["id"])
+                if key in seen:
+                    continue
+                seen.add(key)
+
+            results.append(SearchHit(id=hit["id"], score=score, entity=entity))
+            if len(results) == limit:
+                break
+        return results
+
+    @staticmethod
+    def _as_vectors(data: ndarray|list[ndarray]) -> list[ndarray]:
+        """
+        검색에 사용할 벡터를 pymilvus가 받는 벡터 리스트로 바꾼다.
+
+        (n, dim) 행렬은 각 행의 view로 나누므로 벡터 데이터는 복사되지 않는다.
+        """
+        if isinstance(data, ndarray):
+            return [data] if data.ndim == 1 else list(data)
+        return data
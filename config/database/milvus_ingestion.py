@@ -0,0 +1,266 @@
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+from pymilvus import MilvusException
+
+from app.internal.log.log import log
+from config.database.milvus_database import MilvusDatabase
+from config.models.embedding_model import EmbeddingModel, embedding_model
+
+# 적재 파이프라인 설정
+MILVUS_INGEST_CHUNK_SIZE = int(os.getenv("MILVUS_INGEST_CHUNK_SIZE", "500"))
+MILVUS_INGEST_CHUNK_OVERLAP = int(os.getenv("MILVUS_INGEST_CHUNK_OVERLAP", "50"))
+MILVUS_INGEST_EMBED_BATCH_SIZE = int(os.getenv("MILVUS_INGEST_EMBED_BATCH_SIZE", "64"))
+MILVUS_INGEST_INSERT_BATCH_SIZE = int(os.getenv("MILVUS_INGEST_INSERT_BATCH_SIZE", "512"))
+MILVUS_INGEST_INSERT_BATCH_BYTES = int(os.getenv("MILVUS_INGEST_INSERT_BATCH_BYTES", str(16 * 1024 * 1024)))
+MILVUS_INGEST_QUEUE_SIZE = int(os.getenv("MILVUS_INGEST_QUEUE_SIZE", "4"))
+MILVUS_INGEST_MAX_RETRIES = int(os.getenv("MILVUS_INGEST_MAX_RETRIES", "3"))
+
+
+def chunk_text(text: str, chunk_size: int = MILVUS_INGEST_CHUNK_SIZE, overlap: int = MILVUS_INGEST_CHUNK_OVERLAP) -> list[str]:
+    """
+    텍스트를 chunk_size 글자 이하의 조각으로 나누는 함수
+
+    조각의 끝은 가능하면 공백에 맞추고, 이웃한 조각은 overlap 글자만큼 겹친다.
+    """
+    text = text.strip()
+    if len(text) <= chunk_size:
+        return [text] if text else []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            # 조각의 뒤쪽 절반 안에 공백이 있다면 그 위치에서 자른다.
+            space = text.rfind(" ", start + chunk_size // 2, end)
+            if space != -1:
+                end = space
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+@dataclass
+class IngestionProgress:
+    """
+    적재 진행 상황
+
+    Attributes:
+        documents(int): 읽은 문서 수
+        chunks(int): 임베딩한 조각 수
+        inserted(int): Milvus에 추가된 레코드 수
+        batches(int): Milvus에 보낸 insert 묶음 수
+        retries(int): 재시도한 insert 수
+        elapsed(float): 시작 후 경과 시간(초)
+    """
+    documents: int = 0
+    chunks: int = 0
+    inserted: int = 0
+    batches: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class _InsertBatch:
+    records: list[dict] = field(default_factory=list)
+    vectors: list[np.ndarray] = field(default_factory=list)
+    size: int = 0
+    # 큐에 넣을 때 vectors를 한 번만 쌓은 (n, dim) 행렬 *재시도 시 다시 만들지 않는다.
+    matrix: Optional[np.ndarray] = None
+
+
+def _log_progress(progress: IngestionProgress):
+    log.info(msg=f"[MilvusIngestion] documents={progress.documents} chunks={progress.chunks} "
+                 f"inserted={progress.inserted} batches={progress.batches} retries={progress.retries} "
+                 f"elapsed={progress.elapsed:.1f}s")
+
+
+class MilvusIngestion:
+    """
+    요약:
+        문서를 조각으로 나누고 임베딩하여 Milvus에 적재하는 파이프라인
+
+    설명:
+        호출한 스레드는 문서를 읽어 조각으로 나누고 embed_batch_size 단위로 임베딩한다.
+        임베딩 결과는 레코드 수(insert_batch_size)와 크기(insert_batch_bytes) 한도로 묶여
+        크기가 queue_size인 큐를 통해 insert 스레드로 전달된다.
+        큐가 가득 차면 임베딩이 멈추므로(backpressure) 메모리 사용량은 문서 전체가 아닌 큐 크기에 비례하고,
+        임베딩과 Milvus insert I/O는 서로 겹쳐서 수행된다.
+        insert가 실패하면 max_retries번까지 지수적으로 대기하며 다시 시도하고, 그래도 실패하면 ingest()가 예외를 발생시킨다.
+        적재는 at-least-once이다.
+            - 시간 초과나 연결 오류로 실패한 insert가 실제로는 서버에 반영되었다면, 재시도한 묶음은 중복으로 추가된다. (auto_id 콜렉션)
+            - 중복이 문제가 된다면 문서에 조각마다 고유해지는 필드(예: 문서 id + chunk_index)를 넣고,
+              조회 시 MilvusDatabase.search()의 dedup_field로 중복을 제거한다.
+
+    Attributes:
+        _database(MilvusDatabase): 적재할 Milvus 데이터베이스
+        _model(EmbeddingModel): 임베딩 모델
+        _collection_name(str): 적재할 콜렉션 명
+        _partition_name(str): 적재할 파티션 명
+        _text_field(str): 조각 텍스트를 넣을 필드 명
+        _vector_field(str): 임베딩을 넣을 벡터 필드 명
+        _progress(Callable): 각 insert 묶음 이후 진행 상황의 복사본을 전달받을 함수 *default: 로그 출력
+    """
+    def __init__(self, collection_name: str, partition_name: str, text_field: str = "text", vector_field: str = "embedding",
+                 database: Optional[MilvusDatabase] = None, model: EmbeddingModel = embedding_model,
+                 chunk_size: int = MILVUS_INGEST_CHUNK_SIZE, chunk_overlap: int = MILVUS_INGEST_CHUNK_OVERLAP,
+                 embed_batch_size: int = MILVUS_INGEST_EMBED_BATCH_SIZE,
+                 insert_batch_size: int = MILVUS_INGEST_INSERT_BATCH_SIZE,
+                 insert_batch_bytes: int = MILVUS_INGEST_INSERT_BATCH_BYTES,
+                 queue_size: int = MILVUS_INGEST_QUEUE_SIZE, max_retries: int = MILVUS_INGEST_MAX_RETRIES,
+                 retry_backoff: float = 1.0, vector_dtype: type = np.float32,
+                 progress: Optional[Callable[[IngestionProgress], None]] = _log_progress):
+        self._database = database or MilvusDatabase()
+        self._model = model
+        self._collection_name = collection_name
+        self._partition_name = partition_name
+        self._text_field = text_field
+        self._vector_field = vector_field
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
+        self._embed_batch_size = embed_batch_size
+        self._insert_batch_size = insert_batch_size
+        self._insert_batch_bytes = insert_batch_bytes
+        self._queue_size = queue_size
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._vector_dtype = vector_dtype
+        self._progress = progress
+
+    def ingest(self, documents: Iterable[dict[str, Any]]) -> IngestionProgress:
+        """
+        요약:
+            문서를 모두 적재하고 최종 진행 상황을 반환하는 함수
+
+        Parameters:
+            documents: 적재할 문서 *iterator 가능
+                - 각 문서의 text_field 값은 조각으로 나뉘고, 나머지 필드는 모든 조각 레코드에 복사된다.
+                - 조각 레코드에는 chunk_index(문서 내 조각 순서) 필드가 추가된다.
+        """
+        progress = IngestionProgress()
+        started = time.monotonic()
+        batches: queue.Queue[Optional[_InsertBatch]] = queue.Queue(maxsize=self._queue_size)
+        failure: list[BaseException] = []
+        lock = threading.Lock()
+
+        def insert_worker():
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    return
+                if failure:
+                    continue  # 실패 이후의 묶음은 버리고 종료 신호까지 큐를 비운다.
+                try:
+                    retries = self._insert(batch)
+                except Exception as exception:
+                    failure.append(exception)
+                    continue
+                with lock:
+                    progress.inserted += len(batch.records)
+                    progress.batches += 1
+                    progress.retries += retries
+                    progress.elapsed = time.monotonic() - started
+                    # 호출한 스레드가 계속 갱신하므로, 콜백에는 복사본을 전달한다.
+                    snapshot = replace(progress)
+                if self._progress:
+                    self._progress(snapshot)
+
+        worker = threading.Thread(target=insert_worker, name="milvus-ingestion", daemon=True)
+        worker.start()
+
+        try:
+            pending_records: list[dict] = []
+            pending_texts: list[str] = []
+            batch = _InsertBatch()
+
+            for document in documents:
+                with lock:
+                    progress.documents += 1
+                metadata = {key: value for key, value in document.items() if key != self._text_field}
+                for index, chunk in enumerate(chunk_text(document.get(self._text_field) or "", self._chunk_size, self._chunk_overlap)):
+                    pending_records.append({**metadata, self._text_field: chunk, "chunk_index": index})
+                    pending_texts.append(chunk)
+                    if len(pending_texts) >= self._embed_batch_size:
+                        batch = self._embed(pending_records, pending_texts, batch, batches, failure, progress, lock)
+                        pending_records, pending_texts = [], []
+
+            if pending_texts:
+                batch = self._embed(pending_records, pending_texts, batch, batches, failure, progress, lock)
+            if batch.records:
+                self._put(batches, batch, failure)
+        finally:
+            batches.put(None)
+            worker.join()
+
+        if failure:
+            raise failure[0]
+        progress.elapsed = time.monotonic() - started
+        return progress
+
+    def _embed(self, records: list[dict], texts: list[str], batch: _InsertBatch,
+               batches: queue.Queue, failure: list, progress: IngestionProgress, lock: threading.Lock) -> _InsertBatch:
+        """
+        조각을 임베딩하여 insert 묶음에 추가하고, 한도를 넘은 묶음은 큐에 넣는다.
+        """
+        vectors = self._model.embedding_matrix(texts, dtype=self._vector_dtype)
+        with lock:
+            progress.chunks += len(texts)
+
+        for record, text, vector in zip(records, texts, vectors):
+            size = vector.nbytes + len(text.encode("utf-8"))
+            if batch.records and (len(batch.records) >= self._insert_batch_size or batch.size + size > self._insert_batch_bytes):
+                self._put(batches, batch, failure)
+                batch = _InsertBatch()
+            batch.records.append(record)
+            batch.vectors.append(vector)
+            batch.size += size
+        return batch
+
+    @staticmethod
+    def _put(batches: queue.Queue, batch: _InsertBatch, failure: list):
+        """
+        insert 묶음을 큐에 넣는다. 큐가 가득 차면 insert 스레드가 따라올 때까지 기다린다.
+        """
+        batch.matrix = np.stack(batch.vectors)
+        batch.vectors = []
+        while True:
+            if failure:
+                raise failure[0]
+            try:
+                batches.put(batch, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def _insert(self, batch: _InsertBatch) -> int:
+        """
+        insert 묶음을 Milvus에 추가하고, 재시도한 횟수를 반환한다.
+        *실패로 보인 insert가 서버에 반영되었다면 재시도로 중복 레코드가 생길 수 있다. (at-least-once)
+        """
+        for attempt in range(self._max_retries + 1):
+            try:
+                self._database.insert(
+                    collection_name=self._collection_name,
+                    partition_name=self._partition_name,
+                    # MilvusDatabase.insert()는 전달한 레코드를 수정하지 않으므로 복사하지 않는다.
+                    data=batch.records,
+                    vectors=batch.matrix,
+                    vector_field=self._vector_field
+                )
+                return attempt
+            except (MilvusException, ConnectionError, TimeoutError):
+                if attempt == self._max_retries:
+                    raise
+                time.sleep(self._retry_backoff * (2 ** attempt))
+        return self._max_retries
@@ -0,0 +1,232 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from pymilvus.client.types import LoadState
+
+from app.internal.log.log import log
+from config.database.milvus_database import MilvusDatabase
+
+# 파티션 상주 관리 설정 (동시에 불러 둘 최대 파티션 수, 최대 예상 메모리(0이면 제한 없음), 레코드당 예상 메모리)
+MILVUS_MAX_LOADED_PARTITIONS = int(os.getenv("MILVUS_MAX_LOADED_PARTITIONS", "16"))
+MILVUS_MAX_LOADED_BYTES = int(os.getenv("MILVUS_MAX_LOADED_BYTES", "0"))
+MILVUS_PARTITION_BYTES_PER_ROW = int(os.getenv("MILVUS_PARTITION_BYTES_PER_ROW", "5120"))
+
+
+@dataclass(frozen=True)
+class PartitionStats:
+    """
+    파티션 상주 관리의 사용 통계
+
+    Attributes:
+        hits(int): 이미 불러온 파티션을 사용한 횟수
+        loads(int): 파티션을 불러온 횟수
+        releases(int): LRU로 파티션을 해제한 횟수
+        loaded(int): 현재 불러온 파티션 수
+        loaded_bytes(int): 현재 불러온 파티션의 예상 메모리
+    """
+    hits: int
+    loads: int
+    releases: int
+    loaded: int
+    loaded_bytes: int
+
+
+@dataclass
+class _Partition:
+    size: int = 0
+    references: int = 0
+
+
+class MilvusPartitionManager:
+    """
+    요약:
+        Milvus 파티션을 필요할 때 불러오고, 오래 사용하지 않은 파티션을 해제하는 관리 클래스
+
+    설명:
+        use()로 감싼 조회 전에 파티션을 불러오고(이미 불러왔다면 생략), 블록이 끝날 때까지 해제되지 않도록 고정한다.
+        불러온 파티션 수가 max_partitions, 예상 메모리(레코드 수 x bytes_per_row)가 max_bytes를 넘으면
+        사용 중이 아닌 파티션을 가장 오래 전에 사용한 순서대로 해제한다.
+        같은 파티션을 여러 스레드가 동시에 요청하면 load_partitions는 한 번만 호출되고 나머지는 그 결과를 기다린다.
+
+    Attributes:
+        _database(MilvusDatabase): 파티션을 불러오고 해제할 Milvus 데이터베이스
+        _max_partitions(int): 동시에 불러 둘 최대 파티션 수
+        _max_bytes(int): 불러 둔 파티션의 최대 예상 메모리 *0이면 제한하지 않는다.
+        _bytes_per_row(int): 레코드 하나의 예상 메모리 (벡터 + 스칼라 필드 + 인덱스)
+        _partitions(OrderedDict): 불러온 파티션 (LRU 순서)
+        _loading(dict): 불러오는 중인 파티션과 완료를 알릴 Future
+    """
+    def __init__(self, database: Optional[MilvusDatabase] = None,
+                 max_partitions: int = MILVUS_MAX_LOADED_PARTITIONS, max_bytes: int = MILVUS_MAX_LOADED_BYTES,
+                 bytes_per_row: int = MILVUS_PARTITION_BYTES_PER_ROW):
+        self._database = database or MilvusDatabase()
+        self._max_partitions = max_partitions
+        self._max_bytes = max_bytes
+        self._bytes_per_row = bytes_per_row
+        self._partitions: OrderedDict[tuple[str, str], _Partition] = OrderedDict()
+        self._loading: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._loads = 0
+        self._releases = 0
+
+    @contextmanager
+    def use(self, collection_name: str, partition_names: list[str]) -> Iterator[list[str]]:
+        """
+        요약:
+            파티션을 불러오고, with 블록이 끝날 때까지 해제되지 않도록 고정하는 함수
+
+        Example:
+            with partition_manager.use("passages", ["persona_1"]) as partition_names:
+                database.search(..., partition_names=partition_names, ...)
+        """
+        keys = [(collection_name, partition_name) for partition_name in dict.fromkeys(partition_names)]
+        acquired = []
+        try:
+            for key in keys:
+                self._acquire(key)
+                acquired.append(key)
+            yield list(dict.fromkeys(partition_names))
+        finally:
+            with self._lock:
+                for key in acquired:
+                    partition = self._partitions.get(key)
+                    if partition is not None:
+                        partition.references -= 1
+                released = self._evict()
+            self._release(released)
+
+    def ensure_loaded(self, collection_name: str, partition_names: list[str]):
+        """
+        파티션을 불러오는 함수 *고정하지 않으므로 이후 LRU로 해제될 수 있다.
+        """
+        with self.use(collection_name, partition_names):
+            pass
+
+    def release_all(self):
+        """
+        사용 중이 아닌 모든 파티션을 해제하는 함수
+        """
+        with self._lock:
+            released = [key for key, partition in self._partitions.items() if partition.references == 0]
+            for key in released:
+                del self._partitions[key]
+                self._loading[key] = Future()
+        self._release(released)
+
+    def stats(self) -> PartitionStats:
+        with self._lock:
+            return PartitionStats(
+                hits=self._hits,
+                loads=self._loads,
+                releases=self._releases,
+                loaded=len(self._partitions),
+                loaded_bytes=sum(partition.size for partition in self._partitions.values())
+            )
+
+    def _acquire(self, key: tuple[str, str]):
+        """
+        파티션을 고정하고, 불러오지 않았다면 불러온다.
+        """
+        while True:
+            with self._lock:
+                partition = self._partitions.get(key)
+                if partition is not None:
+                    partition.references += 1
+                    self._partitions.move_to_end(key)
+                    self._hits += 1
+                    return
+
+                future = self._loading.get(key)
+                owner = future is None
+                if owner:
+                    future = self._loading[key] = Future()
+
+            if not owner:
+                # 다른 스레드가 불러오는 중이라면 완료를 기다린 뒤 다시 고정을 시도한다.
+                future.result()
+                continue
+
+            try:
+                size = self._load(key)
+            except BaseException as exception:
+                with self._lock:
+                    del self._loading[key]
+                future.set_exception(exception)
+                raise
+
+            with self._lock:
+                del self._loading[key]
+                self._partitions[key] = _Partition(size=size, references=1)
+                self._loads += 1
+                released = self._evict()
+            future.set_result(None)
+            self._release(released)
+            return
+
+    def _load(self, key: tuple[str, str]) -> int:
+        """
+        파티션을 Milvus에 불러오고(이미 불러와져 있다면 생략) 예상 메모리를 반환한다.
+        """
+        collection_name, partition_name = key
+        state = self._database.get_load_state(collection_name=collection_name, partition_name=partition_name)
+        if state.get("state") != LoadState.Loaded:
+            self._database.load_partitions(collection_name=collection_name, partition_names=[partition_name])
+
+        if not self._max_bytes:
+            return 0
+        stats = self._database.get_connection().get_partition_stats(
+            collection_name=collection_name,
+            partition_name=partition_name
+        )
+        return int(stats.get("row_count", 0)) * self._bytes_per_row
+
+    def _evict(self) -> list[tuple[str, str]]:
+        """
+        한도를 넘은 만큼 사용 중이 아닌 파티션을 LRU 순서로 목록에서 제거하고 반환한다. *_lock 안에서 호출한다.
+        """
+        loaded_bytes = sum(partition.size for partition in self._partitions.values())
+        released = []
+        for key, partition in list(self._partitions.items()):
+            over_count = len(self._partitions) > self._max_partitions
+            over_bytes = bool(self._max_bytes) and loaded_bytes > self._max_bytes
+            if not (over_count or over_bytes):
+                break
+            if partition.references > 0:
+                continue
+            del self._partitions[key]
+            # 해제가 끝나기 전에 같은 파티션을 요청하면, 해제 후 다시 불러오도록 기다리게 한다.
+            self._loading[key] = Future()
+            loaded_bytes -= partition.size
+            released.append(key)
+        return released
+
+    def _release(self, keys: list[tuple[str, str]]):
+        """
+        목록에서 제거된 파티션을 Milvus에서 해제하고, 해제를 기다리던 요청을 깨운다. *_lock 밖에서 호출한다.
+        해제 실패는 로그만 남기고 전파하지 않는다. (use()의 결과나 예외를 가리지 않도록)
+        해제에 실패한 파티션은 서버에 남아 있을 수 있으나, 다음 요청 시 상태를 확인하여 다시 사용한다.
+        """
+        collections: dict[str, list[str]] = {}
+        for collection_name, partition_name in keys:
+            collections.setdefault(collection_name, []).append(partition_name)
+        try:
+            for collection_name, partition_names in collections.items():
+                try:
+                    self._database.release_partitions(collection_name=collection_name, partition_names=partition_names)
+                except Exception as exception:
+                    log.error(msg=f"[MilvusPartitionManager] 파티션 해제 실패 {collection_name}{partition_names}: {exception}")
+                    continue
+                with self._lock:
+                    self._releases += len(partition_names)
+        finally:
+            # 해제 성공 여부와 관계없이, 해제를 기다리던 모든 요청을 깨운다.
+            with self._lock:
+                futures = [self._loading.pop(key) for key in keys]
+            for future in futures:
+                future.set_result(None)
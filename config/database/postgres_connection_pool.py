@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+
+class PostgresConnectionPool:
+    """
+    요약:
+        psycopg2 Connection을 스레드 안전하게 빌려주고 반납받는 풀 클래스
+
+    설명:
+        최소(min_size) 개수만큼 Connection을 미리 생성하고, 요청이 몰리면 최대(max_size) 개수까지 늘린다.
+        모든 Connection이 사용 중이면 timeout 동안 반납을 기다리고, 그래도 없으면 PoolError를 발생시킨다.
+        대여 시 상태를 점검(health check)하여 끊어진 Connection은 폐기 후 새로 생성한다.
+
+    Attributes:
+        _connect: 새로운 Connection을 생성하는 함수
+        _min_size(int): 유지할 최소 Connection 수
+        _max_size(int): 생성 가능한 최대 Connection 수
+        _timeout(float): Connection 대여 대기 시간(초)
+        _health_check_interval(float): 이 시간(초) 이상 쉬고 있던 Connection은 대여 전 SELECT 1로 점검한다.
+        _idle(deque): 대여 가능한 (Connection, 반납 시각) 묶음
+        _size(int): 현재 생성된 Connection 수 (대여 중 + 대기 중)
+        _condition(Condition): 대여/반납을 동기화하기 위한 객체
+    """
+    def __init__(self, connect: Callable[[], extensions.connection], min_size: int = 1, max_size: int = 10,
+                 timeout: float = 30.0, health_check_interval: float = 30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"잘못된 풀 크기입니다. (min_size={min_size}, max_size={max_size})")
+
+        self._connect = connect
+        self._min_size = min_size
+        self._max_size = max_size
+        self._timeout = timeout
+        self._health_check_interval = health_check_interval
+
+        self._idle: deque[tuple[extensions.connection, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def getconn(self, timeout: float | None = None) -> extensions.connection:
+        """
+        풀에서 Connection을 대여하는 함수
+
+        Parameters:
+            timeout(float): 대여 대기 시간(초) *default: 풀 생성 시 지정한 timeout
+
+        Raises:
+            PoolError: 풀이 닫혔거나 timeout 동안 Connection을 대여하지 못한 경우
+        """
+        deadline = time.monotonic() + (self._timeout if timeout is None else timeout)
+
+        while True:
+            connection, returned_at = self._acquire(deadline)
+
+            # 빈 자리만 확보한 경우, 새로운 Connection을 생성한다.
+            if connection is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+
+            if self._is_healthy(connection, returned_at):
+                return connection
+
+            # 끊어진 Connection은 폐기하고 다시 대여를 시도한다.
+            self._close_quietly(connection)
+            self._release_slot()
+
+    def putconn(self, connection: extensions.connection, discard: bool = False):
+        """
+        대여한 Connection을 풀에 반납하는 함수
+
+        종료되지 않은 트랜잭션은 rollback 후 반납하며, 끊어졌거나 discard가 True인 Connection은 폐기한다.
+
+        Parameters:
+            connection(connection): 반납할 Connection
+            discard(bool): True라면 Connection을 재사용하지 않고 폐기한다.
+        """
+        if not discard and not connection.closed:
+            try:
+                if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        with self._condition:
+            reusable = not (discard or connection.closed or self._closed)
+            if reusable:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._size -= 1
+            self._condition.notify()
+
+        if not reusable:
+            self._close_quietly(connection)
+
+    def closeall(self):
+        """
+        풀을 닫고 대기 중인 모든 Connection을 종료하는 함수
+
+        대여 중인 Connection은 반납되는 시점에 종료된다.
+        """
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+    @property
+    def size(self) -> int:
+        """
+        현재 생성된 Connection 수 (대여 중 + 대기 중)
+        """
+        return self._size
+
+    @property
+    def idle_size(self) -> int:
+        """
+        대여 가능한 Connection 수
+        """
+        return len(self._idle)
+
+    def _acquire(self, deadline: float) -> tuple[extensions.connection | None, float]:
+        """
+        대기 중인 Connection을 꺼내거나, 새로 생성할 자리를 확보하는 함수
+
+        Returns:
+            (Connection, 반납 시각) 또는 새로 생성해야 한다면 (None, 0.0)
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+
+                # 가장 최근에 반납된 Connection부터 사용한다. (LIFO)
+                if self._idle:
+                    return self._idle.pop()
+
+                if self._size < self._max_size:
+                    self._size += 1
+                    return None, 0.0
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolError(f"connection pool exhausted (max_size={self._max_size})")
+                self._condition.wait(remaining)
+
+    def _release_slot(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def _is_healthy(self, connection: extensions.connection, returned_at: float) -> bool:
+        """
+        대여 직전 Connection의 상태를 점검하는 함수
+        """
+        if connection.closed:
+            return False
+
+        if time.monotonic() - returned_at < self._health_check_interval:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(connection: extensions.connection):
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
@@ -1,12 +1,20 @@
 import os
+from contextlib import contextmanager
+from functools import partial
+from typing import Iterable, Iterator
+from uuid import uuid4
 
 import psycopg2
 from psycopg2 import DatabaseError
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError
 
 from app.internal.exception.controlled_exception import ControlledException, ErrorMessage
 from app.internal.exception.errorcode import basic_error_code
 from config.common.common_database import CommonDatabase
 from config.common.singleton import Singleton
+from config.database.postgres_connection_pool import PostgresConnectionPool
+from config.database.postgres_prepared_statement import PreparedConnection, PreparedStatementRegistry
 
 POSTGRES_HOST = os.getenv("POSTGRES_HOST")
 POSTGRES_DATABASE = os.getenv("POSTGRES_DATABASE")
@@ -14,43 +22,125 @@ POSTGRES_USER = os.getenv("POSTGRES_USER")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
 POSTGRES_PORT = os.getenv("POSTGRES_PORT")
 
-# TODO 1. 멀티스레드로 다중성 관리하기 # ConnectionPool
+# ConnectionPool 설정
+POSTGRES_POOL_MIN_SIZE = int(os.getenv("POSTGRES_POOL_MIN_SIZE", "1"))
+POSTGRES_POOL_MAX_SIZE = int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10"))
+POSTGRES_POOL_TIMEOUT = float(os.getenv("POSTGRES_POOL_TIMEOUT", "30"))
+POSTGRES_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("POSTGRES_POOL_HEALTH_CHECK_INTERVAL", "30"))
+
+# Prepared Statement 설정
+POSTGRES_PREPARED_MAX_STATEMENTS = int(os.getenv("POSTGRES_PREPARED_MAX_STATEMENTS", "256"))
+POSTGRES_PREPARED_MAX_PER_CONNECTION = int(os.getenv("POSTGRES_PREPARED_MAX_PER_CONNECTION", "64"))
+
 class PostgresDatabase(CommonDatabase, metaclass=Singleton):
     """
     PostgreSQL을 이용하기 위한 클래스
 
     psycopg2를 이용한 CommonDatabase 구현체
+    각 함수는 ConnectionPool에서 Connection을 빌려 사용한 뒤 반납하므로, 여러 스레드에서 동시에 호출할 수 있다.
     """
-    _connection = None
-
-    def __init__(self, host=POSTGRES_HOST, database=POSTGRES_DATABASE, user=POSTGRES_USER, password=POSTGRES_PASSWORD, port=POSTGRES_PORT):
-        self._connection = psycopg2.connect(
-            host=host,
-            database=database,
-            user=user,
-            password=password,
-            port=port
+    _pool: PostgresConnectionPool = None
+    _prepared: PreparedStatementRegistry = None
+
+    def __init__(self, host=POSTGRES_HOST, database=POSTGRES_DATABASE, user=POSTGRES_USER, password=POSTGRES_PASSWORD, port=POSTGRES_PORT,
+                 min_size=POSTGRES_POOL_MIN_SIZE, max_size=POSTGRES_POOL_MAX_SIZE, timeout=POSTGRES_POOL_TIMEOUT,
+                 health_check_interval=POSTGRES_POOL_HEALTH_CHECK_INTERVAL,
+                 prepared_max_statements=POSTGRES_PREPARED_MAX_STATEMENTS, prepared_max_per_connection=POSTGRES_PREPARED_MAX_PER_CONNECTION):
+        self._prepared = PreparedStatementRegistry(
+            max_statements=prepared_max_statements,
+            max_per_connection=prepared_max_per_connection
+        )
+        self._pool = PostgresConnectionPool(
+            connect=partial(
+                psycopg2.connect,
+                host=host,
+                database=database,
+                user=user,
+                password=password,
+                port=port,
+                connection_factory=PreparedConnection,
+                cursor_factory=RealDictCursor
+            ),
+            min_size=min_size,
+            max_size=max_size,
+            timeout=timeout,
+            health_check_interval=health_check_interval
         )
 
+    @contextmanager
     def get_connection(self):
-        return self._connection
+        """
+        ConnectionPool에서 Connection을 빌려주고, with 블록이 끝나면 반납한다.
+
+        반납 시 종료되지 않은 트랜잭션은 rollback되며, 끊어진 Connection은 폐기된다.
+        """
+        try:
+            connection = self._pool.getconn()
+        except PoolError:
+            raise ControlledException(basic_error_code.DATABASE_POOL_TIMEOUT)
+        except DatabaseError:
+            raise ControlledException(basic_error_code.DATABASE_ERROR)
+
+        try:
+            yield connection
+        finally:
+            self._pool.putconn(connection)
 
+    @contextmanager
     def get_cursor(self):
-        return self._connection.cursor()
+        with self.get_connection() as connection:
+            with connection.cursor() as cursor:
+                yield cursor
+
+    def close(self):
+        """
+        ConnectionPool의 모든 Connection을 종료하는 함수
+        """
+        self._pool.closeall()
 
     def execute_update(self, sql: str, values: tuple=()):
+        with self.get_connection() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, values)
+                connection.commit()
+            except DatabaseError:
+                # 실패한 트랜잭션은 반납 시 rollback 된다.
+                raise ControlledException(basic_error_code.DATABASE_ERROR)
+
+    def execute_query(self, sql: str, values: tuple=(), prepare: bool=False):
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute(sql, values)
-            self._connection.commit()
+            with self.get_connection() as connection:
+                with connection.cursor() as cursor:
+                    if prepare:
+                        self._prepared.execute(connection, cursor, sql, values)
+                    else:
+                        cursor.execute(sql, values)
+                    return cursor.fetchall()
         except DatabaseError:
-            self._connection.rollback()
             raise ControlledException(basic_error_code.DATABASE_ERROR)
 
-    def execute_query(self, sql: str, values: tuple=()):
+    def execute_batch(self, statements: Iterable[tuple[str, tuple]]) -> list[list]:
+        with self.get_connection() as connection:
+            try:
+                results = []
+                with connection.cursor() as cursor:
+                    for sql, values in statements:
+                        cursor.execute(sql, values)
+                        results.append(cursor.fetchall() if cursor.description else [])
+                connection.commit()
+                return results
+            except DatabaseError:
+                # 실패한 트랜잭션은 반납 시 rollback 된다.
+                raise ControlledException(basic_error_code.DATABASE_ERROR)
+
+    def execute_stream(self, sql: str, values: tuple=(), batch_size: int=1000) -> Iterator[dict]:
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute(sql, values)
-                return cursor.fetchall()
+            with self.get_connection() as connection:
+                # 이름을 가진 cursor는 PostgreSQL 서버 측 cursor로 생성된다.
+                with connection.cursor(name=f"stream_{uuid4().hex}") as cursor:
+                    cursor.itersize = batch_size
+                    cursor.execute(sql, values)
+                    yield from cursor
         except DatabaseError:
-            raise ControlledException(basic_error_code.DATABASE_ERROR)
\ No newline at end of file
+            raise ControlledException(basic_error_code.DATABASE_ERROR)
@@ -0,0 +1,143 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from psycopg2 import errors, extensions
+
+
+class PreparedConnection(extensions.connection):
+    """
+    서버에 준비(PREPARE)해 둔 statement 이름을 기억하는 psycopg2 Connection
+
+    psycopg2.connect(connection_factory=PreparedConnection)으로 생성한다.
+    재연결로 생성된 Connection은 빈 상태로 시작하므로, statement는 처음 사용할 때 다시 준비된다.
+
+    Attributes:
+        prepared(OrderedDict): 이 Connection에 준비된 statement 이름 (LRU 순서)
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: OrderedDict[str, None] = OrderedDict()
+
+
+@dataclass(frozen=True)
+class PreparedStatement:
+    """
+    준비된 statement의 정보
+
+    Attributes:
+        name(str): 서버에서 사용할 statement 이름 (SQL의 해시로 만들어 모든 Connection에서 같다)
+        text(str): %s를 $1, $2, ...로 바꾼 SQL
+        parameter_count(int): 파라미터 수
+    """
+    name: str
+    text: str
+    parameter_count: int
+
+
+class PreparedStatementRegistry:
+    """
+    요약:
+        SQL을 서버 측 prepared statement로 실행하는 저장소
+
+    설명:
+        같은 SQL은 Connection마다 한 번만 PREPARE 하고, 이후에는 EXECUTE로 실행하여
+        서버의 parse/plan 비용을 줄인다.
+        statement 이름은 SQL의 해시로 정해지므로 재연결이나 저장소 교체 후에도 같은 이름을 사용한다.
+
+    Attributes:
+        _max_statements(int): 저장소가 기억할 최대 SQL 수
+        _max_per_connection(int): Connection마다 준비해 둘 최대 statement 수 *넘으면 DEALLOCATE 한다.
+        _statements(OrderedDict): SQL과 PreparedStatement의 매핑 (LRU 순서)
+    """
+    def __init__(self, max_statements: int = 256, max_per_connection: int = 64):
+        self._max_statements = max_statements
+        self._max_per_connection = max_per_connection
+        self._statements: OrderedDict[str, Optional[PreparedStatement]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sql: str) -> Optional[PreparedStatement]:
+        """
+        SQL의 PreparedStatement를 반환하는 함수
+
+        %(name)s 처럼 준비할 수 없는 SQL이라면 None을 반환한다.
+        """
+        with self._lock:
+            if sql in self._statements:
+                self._statements.move_to_end(sql)
+                return self._statements[sql]
+
+            statement = self._compile(sql)
+            self._statements[sql] = statement
+            while len(self._statements) > self._max_statements:
+                self._statements.popitem(last=False)
+            return statement
+
+    def execute(self, connection: PreparedConnection, cursor, sql: str, values: tuple = ()):
+        """
+        SQL을 prepared statement로 실행하는 함수
+
+        트랜잭션의 첫 SQL로 호출해야 한다.
+        서버에 statement가 없거나(DISCARD 등) 이미 있다면 rollback 후 한 번 다시 시도한다.
+        """
+        statement = self.get(sql)
+        if statement is None or not isinstance(connection, PreparedConnection):
+            cursor.execute(sql, values)
+            return
+
+        try:
+            self._execute(connection, cursor, statement, values)
+        except errors.InvalidSqlStatementName:
+            connection.rollback()
+            connection.prepared.pop(statement.name, None)
+            self._execute(connection, cursor, statement, values)
+        except errors.DuplicatePreparedStatement:
+            connection.rollback()
+            connection.prepared[statement.name] = None
+            self._execute(connection, cursor, statement, values)
+
+    def _execute(self, connection: PreparedConnection, cursor, statement: PreparedStatement, values: tuple):
+        if statement.name in connection.prepared:
+            connection.prepared.move_to_end(statement.name)
+        else:
+            cursor.execute(f"PREPARE {statement.name} AS {statement.text}")
+            connection.prepared[statement.name] = None
+            while len(connection.prepared) > self._max_per_connection:
+                name, _ = connection.prepared.popitem(last=False)
+                cursor.execute(f"DEALLOCATE {name}")
+
+        if statement.parameter_count:
+            placeholders = ", ".join(["%s"] * statement.parameter_count)
+            cursor.execute(f"EXECUTE {statement.name} ({placeholders})", values)
+        else:
+            cursor.execute(f"EXECUTE {statement.name}")
+
+    @staticmethod
+    def _compile(sql: str) -> Optional[PreparedStatement]:
+        """
+        psycopg2의 %s placeholder를 PostgreSQL의 $n placeholder로 바꾼다.
+        """
+        text = []
+        count = 0
+        index = 0
+        while index < len(sql):
+            char = sql[index]
+            if char != "%":
+                text.append(char)
+                index += 1
+                continue
+
+            following = sql[index + 1:index + 2]
+            if following == "s":
+                count += 1
+                text.append(f"${count}")
+            elif following == "%":
+                text.append("%")
+            else:
+                return None
+            index += 2
+
+        name = "stmt_" + hashlib.sha1(sql.encode("utf-8")).hexdigest()[:16]
+        return PreparedStatement(name=name, text="".join(text), parameter_count=count)
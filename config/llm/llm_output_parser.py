@@ -0,0 +1,81 @@
+import json
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson은 선택 의존성이다.
+    orjson = None
+
+# 한 번의 탐색에서 찾을 토큰: <think> 블록의 시작, 중괄호, 문자열의 시작
+_TOKEN = re.compile(r'<think>|[{}"]')
+_THINK_END = "</think>"
+# 문자열의 시작 따옴표 이후, 닫는 따옴표까지
+_STRING_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+# 균형 잡힌 객체가 없을 때 사용하는 정리 규칙
+_THINK_BLOCK = re.compile(r"<think>.*?</think>\s*", re.DOTALL)
+_FENCE = re.compile(r"```[A-Za-z]*")
+
+
+def extract_json(text: str) -> str:
+    """
+    요약:
+        LLM 출력에서 <think> 블록을 제외한 첫 번째 균형 잡힌 JSON 객체({ ... })를 반환하는 함수
+
+    설명:
+        정규식 하나로 텍스트를 한 번만 훑으며, 문자열 안의 중괄호와 escape는 건너뛴다.
+        코드펜스가 앞뒤가 아닌 중간에 있거나 JSON 앞뒤에 설명 문장이 있어도 객체만 꺼낸다.
+        균형 잡힌 객체가 없다면 <think> 블록과 코드펜스만 제거한 텍스트를 반환한다. (이후 JSON 파싱에서 실패한다)
+    """
+    depth = 0
+    start = -1
+    skipped: list[tuple[int, int]] = []  # 객체 안에 있는 <think> 블록
+    position = 0
+
+    while (match := _TOKEN.search(text, position)) is not None:
+        token = match.group()
+        position = match.end()
+
+        if token[0] == "<":
+            # <think> 블록은 닫는 태그까지(닫히지 않았다면 끝까지) 건너뛴다.
+            end = text.find(_THINK_END, position)
+            position = len(text) if end == -1 else end + len(_THINK_END)
+            if depth:
+                skipped.append((match.start(), position))
+        elif token == '"':
+            # 객체 밖의 따옴표는 설명 문장의 일부이므로 무시한다.
+            if depth:
+                end = _STRING_END.match(text, position)
+                if end is None:
+                    break
+                position = end.end()
+        elif token == "{":
+            if not depth:
+                start = match.start()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if not depth:
+                if not skipped:
+                    return text[start:position]
+                parts = []
+                cursor = start
+                for skip_start, skip_end in skipped:
+                    parts.append(text[cursor:skip_start])
+                    cursor = skip_end
+                parts.append(text[cursor:position])
+                return "".join(parts)
+
+    return _FENCE.sub("", _THINK_BLOCK.sub("", text)).strip()
+
+
+def loads(text: str) -> Any:
+    """
+    JSON 문자열을 파싱하는 함수 *orjson이 설치되어 있다면 orjson을 사용한다.
+
+    Raises:
+        json.JSONDecodeError: 파싱 실패 시 (orjson.JSONDecodeError도 이를 상속한다)
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
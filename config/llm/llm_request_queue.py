@@ -0,0 +1,210 @@
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from app.internal.exception.controlled_exception import ControlledException
+from app.internal.exception.errorcode import llm_error_code
+
+# LLM 동시 실행 설정 (Ollama 서버의 OLLAMA_NUM_PARALLEL과 맞출 것)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "1"))
+# 실행을 기다릴 수 있는 최대 요청 수 (넘으면 즉시 거절한다), 최대 대기 시간(초)
+LLM_MAX_QUEUE_SIZE = int(os.getenv("LLM_MAX_QUEUE_SIZE", "64"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "60"))
+
+
+@dataclass(frozen=True)
+class LLMQueueStats:
+    """
+    LLM 요청 대기열의 사용 통계
+
+    Attributes:
+        running(int): 실행 중인 요청 수
+        waiting(int): 대기 중인 요청 수
+        admitted(int): 실행된 요청 수
+        rejected(int): 대기열이 가득 차 거절된 요청 수
+        timeouts(int): 대기 시간을 넘겨 실패한 요청 수
+        average_wait_ms(float): 실행된 요청의 평균 대기 시간(ms)
+        max_wait_ms(float): 실행된 요청의 최대 대기 시간(ms)
+    """
+    running: int
+    waiting: int
+    admitted: int
+    rejected: int
+    timeouts: int
+    average_wait_ms: float
+    max_wait_ms: float
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    wake: Callable[[], None] = field(compare=False)
+    granted: bool = field(default=False, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class LLMRequestQueue:
+    """
+    요약:
+        LLM 호출의 동시 실행 수를 제한하고, 나머지 요청을 우선순위 순서로 대기시키는 대기열
+
+    설명:
+        실행 중인 요청이 max_concurrency보다 적다면 바로 실행하고, 아니라면 (priority, 도착 순서)가 작은 요청부터 실행한다.
+        대기 중인 요청이 max_queue_size개라면 새 요청은 기다리지 않고 ControlledException(LLM_QUEUE_FULL)으로 거절한다. (load shedding)
+        timeout 동안 실행되지 못한 요청은 ControlledException(LLM_QUEUE_TIMEOUT)으로 실패한다.
+        동기 호출(acquire)과 비동기 호출(aacquire)이 같은 실행 슬롯을 나누어 사용한다.
+
+    Attributes:
+        _max_concurrency(int): 동시에 실행할 최대 요청 수
+        _max_queue_size(int): 대기할 수 있는 최대 요청 수
+        _timeout(float): 최대 대기 시간(초)
+        _waiters(list[_Waiter]): 대기 중인 요청 (heap)
+    """
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, max_queue_size: int = LLM_MAX_QUEUE_SIZE,
+                 timeout: float = LLM_QUEUE_TIMEOUT):
+        self._max_concurrency = max_concurrency
+        self._max_queue_size = max_queue_size
+        self._timeout = timeout
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+        self._running = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    @contextmanager
+    def acquire(self, priority: int = 0):
+        """
+        실행 슬롯을 얻을 때까지 기다리고, with 블록이 끝나면 반납하는 함수 (동기)
+
+        Parameters:
+            priority(int): 작을수록 먼저 실행된다. *default: 0
+        """
+        started = time.monotonic()
+        event = threading.Event()
+        waiter = self._enter(priority, event.set)
+        if waiter is not None and not event.wait(self._timeout):
+            self._cancel(waiter)
+        self._admit(started)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aacquire(self, priority: int = 0):
+        """
+        실행 슬롯을 얻을 때까지 기다리고, async with 블록이 끝나면 반납하는 함수 (비동기)
+
+        Parameters:
+            priority(int): 작을수록 먼저 실행된다. *default: 0
+        """
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = self._enter(priority, wake)
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(future), self._timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as exception:
+                self._cancel(waiter, raise_timeout=isinstance(exception, asyncio.TimeoutError))
+                if isinstance(exception, asyncio.CancelledError):
+                    raise
+        self._admit(started)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> LLMQueueStats:
+        with self._lock:
+            return LLMQueueStats(
+                running=self._running,
+                waiting=self._waiting,
+                admitted=self._admitted,
+                rejected=self._rejected,
+                timeouts=self._timeouts,
+                average_wait_ms=self._total_wait / self._admitted * 1000 if self._admitted else 0.0,
+                max_wait_ms=self._max_wait * 1000
+            )
+
+    def _enter(self, priority: int, wake: Callable[[], None]) -> Optional[_Waiter]:
+        """
+        빈 슬롯이 있다면 바로 차지하고 None을, 없다면 대기열에 넣은 _Waiter를 반환한다.
+        """
+        with self._lock:
+            if self._running < self._max_concurrency and not self._waiting:
+                self._running += 1
+                return None
+            if self._waiting >= self._max_queue_size:
+                self._rejected += 1
+                raise ControlledException(llm_error_code.LLM_QUEUE_FULL)
+
+            waiter = _Waiter(priority=priority, sequence=next(self._sequence), wake=wake)
+            heapq.heappush(self._waiters, waiter)
+            self._waiting += 1
+            return waiter
+
+    def _cancel(self, waiter: _Waiter, raise_timeout: bool = True):
+        """
+        대기를 포기한다. 포기하기 직전에 슬롯을 받았다면 포기하지 않고 실행한다.
+        """
+        with self._lock:
+            if waiter.granted:
+                if raise_timeout:
+                    return
+                # 취소된 요청이 받은 슬롯은 다음 요청에 넘긴다.
+                self._running -= 1
+                self._grant()
+                return
+            waiter.cancelled = True
+            self._waiting -= 1
+            if raise_timeout:
+                self._timeouts += 1
+        if raise_timeout:
+            raise ControlledException(llm_error_code.LLM_QUEUE_TIMEOUT)
+
+    def _admit(self, started: float):
+        wait = time.monotonic() - started
+        with self._lock:
+            self._admitted += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def _release(self):
+        with self._lock:
+            self._running -= 1
+            self._grant()
+
+    def _grant(self):
+        """
+        빈 슬롯을 우선순위가 가장 높은 대기 요청에 넘긴다. *_lock 안에서 호출한다.
+        """
+        while self._running < self._max_concurrency and self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            if waiter.cancelled:
+                continue
+            waiter.granted = True
+            self._waiting -= 1
+            self._running += 1
+            waiter.wake()
@@ -0,0 +1,207 @@
+import json
+import re
+
+# 스트림에서 제거할 표식 (<think> 블록의 시작/끝, 코드펜스와 언어 명)
+_MARKER = re.compile(r"<think>|</think>|```[A-Za-z]*")
+_MARKER_PREFIXES = ("<think>", "</think>", "```")
+_MARKER_MAX_LENGTH = max(map(len, _MARKER_PREFIXES))
+_THINK_END = "</think>"
+# JSON 문자열 밖에서 찾을 토큰 (표식, 중괄호, 문자열의 시작)
+_TOKEN = re.compile(r'<think>|</think>|```[A-Za-z]*|[{}"]')
+# JSON 문자열 안에서 찾을 토큰 (닫는 따옴표, escape)
+_STRING_TOKEN = re.compile(r'["\\]')
+
+# JSON 문자열 안의 내용 (닫는 따옴표 전까지)
+_STRING_CONTENT = re.compile(r'(?:[^"\\]|\\.)*', re.DOTALL)
+# 아직 끝나지 않은 \u escape 또는 짝(low surrogate)을 기다리는 high surrogate
+_INCOMPLETE_ESCAPE = re.compile(r'(?:\\u[dD][89abAB][0-9a-fA-F]{2})?(?:\\u[0-9a-fA-F]{0,3})?$')
+
+
+class ThinkFenceFilter:
+    """
+    요약:
+        토큰 스트림에서 <think> ... </think> 블록과 코드펜스(```json, ```)를 제거하는 필터
+
+    설명:
+        표식이 여러 조각에 걸쳐 도착할 수 있으므로, 표식의 앞부분일 수 있는 끝부분은 다음 조각이 올 때까지 보류한다.
+        JSON 객체 안의 문자열 값에 들어 있는 표식은 답변의 일부이므로 제거하지 않는다. (\\ escape 포함)
+        객체 밖의 따옴표는 설명 문장의 일부로 보고 문자열로 취급하지 않는다. (llm_output_parser.extract_json()과 같은 규칙)
+    """
+    def __init__(self):
+        self._pending = ""
+        self._in_think = False
+        self._in_string = False
+        self._escape = False
+        self._depth = 0
+
+    def feed(self, text: str) -> str:
+        """
+        조각을 받아, 표식을 제거하고 확정된 텍스트를 반환하는 함수
+        """
+        buffer = self._pending + text
+        self._pending = ""
+        output = []
+        position = 0
+        while position < len(buffer):
+            if self._in_think:
+                end = buffer.find(_THINK_END, position)
+                if end == -1:
+                    # <think> 블록 안의 텍스트는 버리고, </think>의 앞부분일 수 있는 끝부분만 보류한다.
+                    remaining = buffer[position:]
+                    self._pending = remaining[self._partial_marker(remaining, (_THINK_END,)):]
+                    break
+                self._in_think = False
+                position = end + len(_THINK_END)
+            elif self._in_string:
+                position = self._string(buffer, position, output)
+            else:
+                match = _TOKEN.search(buffer, position)
+                if match is None:
+                    remaining = buffer[position:]
+                    hold = self._partial_marker(remaining)
+                    output.append(remaining[:hold])
+                    self._pending = remaining[hold:]
+                    break
+                token = match.group()
+                if match.end() == len(buffer) and token.startswith("```"):
+                    # 코드펜스의 언어 명은 다음 조각에서 이어질 수 있으므로 보류한다.
+                    output.append(buffer[position:match.start()])
+                    self._pending = token
+                    break
+
+                if token in '{}"':
+                    output.append(buffer[position:match.end()])
+                    if token == "{":
+                        self._depth += 1
+                    elif token == "}":
+                        self._depth = max(0, self._depth - 1)
+                    elif self._depth:
+                        self._in_string = True
+                else:
+                    output.append(buffer[position:match.start()])
+                    self._in_think = token == "<think>"
+                position = match.end()
+        return "".join(output)
+
+    def flush(self) -> str:
+        """
+        스트림이 끝났을 때 보류한 텍스트를 반환하는 함수
+        """
+        pending, self._pending = self._pending, ""
+        if self._in_think or _MARKER.fullmatch(pending):
+            return ""
+        return pending
+
+    def _string(self, buffer: str, position: int, output: list[str]) -> int:
+        """
+        JSON 문자열 안의 텍스트를 그대로 내보내고, 다음에 읽을 위치를 반환한다.
+        """
+        if self._escape:
+            # 이전 조각이 \로 끝났다면, 이 조각의 첫 글자는 escape된 글자이다.
+            self._escape = False
+            output.append(buffer[position])
+            return position + 1
+
+        match = _STRING_TOKEN.search(buffer, position)
+        if match is None:
+            output.append(buffer[position:])
+            return len(buffer)
+        output.append(buffer[position:match.end()])
+        if match.group() == '"':
+            self._in_string = False
+        else:
+            self._escape = True
+        return match.end()
+
+    @staticmethod
+    def _partial_marker(text: str, markers: tuple[str, ...] = _MARKER_PREFIXES) -> int:
+        """
+        text의 끝에서 표식의 앞부분일 수 있는 부분이 시작되는 위치를 반환한다. *없다면 len(text)
+        """
+        for start in range(max(0, len(text) - _MARKER_MAX_LENGTH + 1), len(text)):
+            suffix = text[start:]
+            if any(marker.startswith(suffix) for marker in markers):
+                return start
+        return len(text)
+
+
+class JsonStringExtractor:
+    """
+    요약:
+        스트리밍 중인 JSON 텍스트에서 하나의 문자열 필드 값을 점진적으로 꺼내는 클래스
+
+    설명:
+        "field": " 가 나타난 뒤부터 닫는 따옴표까지의 문자열을 escape를 풀어 조각마다 반환한다.
+        JSON 전체를 파싱하지 않으므로 처음 나타난 같은 이름의 필드를 사용한다.
+        \\uXXXX escape와 surrogate pair가 조각에 걸쳐 나뉘어도 올바르게 디코딩한다.
+    """
+    def __init__(self, field: str):
+        self._key = re.compile(rf'"{re.escape(field)}"\s*:\s*"')
+        self._buffer = ""
+        self._started = False
+        self.done = False
+
+    def feed(self, text: str) -> str:
+        """
+        조각을 받아, 새로 확정된 필드 값을 반환하는 함수
+        """
+        if self.done:
+            return ""
+
+        self._buffer += text
+        if not self._started:
+            match = self._key.search(self._buffer)
+            if match is None:
+                # 필드 명이 조각에 걸쳐 있을 수 있으므로 끝부분만 남긴다.
+                self._buffer = self._buffer[-256:]
+                return ""
+            self._started = True
+            self._buffer = self._buffer[match.end():]
+
+        content = _STRING_CONTENT.match(self._buffer).group()
+        if len(content) < len(self._buffer) and self._buffer[len(content)] == '"':
+            self.done = True
+            self._buffer = ""
+            return json.loads(f'"{content}"')
+
+        # 닫는 따옴표 전이라면, 끝나지 않은 escape를 남기고 디코딩한다.
+        safe = content[:_INCOMPLETE_ESCAPE.search(content).start()]
+        self._buffer = self._buffer[len(safe):]
+        return json.loads(f'"{safe}"') if safe else ""
+
+
+class LLMStreamParser:
+    """
+    요약:
+        LLM 토큰 스트림에서 <think> 블록과 코드펜스를 제거하고, 응답 JSON의 문자열 필드를 점진적으로 꺼내는 파서
+
+    Example:
+        parser = LLMStreamParser("message")
+        async for chunk in chain.astream(parameter):
+            delta = parser.feed(chunk.content)  # {"result": {"message": "..."}}의 message 조각
+        parser.flush()
+        result = json.loads(parser.text)
+
+    Attributes:
+        text(str): 표식을 제거한, 지금까지의 전체 텍스트
+    """
+    def __init__(self, field: str = "message"):
+        self._filter = ThinkFenceFilter()
+        self._extractor = JsonStringExtractor(field)
+        self._parts: list[str] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts).strip()
+
+    def feed(self, chunk: str) -> str:
+        return self._consume(self._filter.feed(chunk))
+
+    def flush(self) -> str:
+        return self._consume(self._filter.flush())
+
+    def _consume(self, clean: str) -> str:
+        if not clean:
+            return ""
+        self._parts.append(clean)
+        return self._extractor.feed(clean)
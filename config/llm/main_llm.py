@@ -54,41 +54,52 @@ class MainLLM(CommonLLM, metaclass=Singleton):
         A. {"result":{"message": "점심으로 김치찌개를 먹었고 너무 매워서 물을 많이 마셨어. 그런데 맛있어서 만족했어."}}
         """)
 
+    # 모든 요청에서 같은 템플릿 인자 *프롬프트에 미리 채워(partial) 두므로 요청마다 전달하지 않는다.
+    _FIXED_PARAMETERS = {
+        "role": "your my friend talking to me",
+        "guidelines": "takling to informally and using korean",
+        "output_schema": '```json {"result":{"message": "<sentence>"}} ```',
+        "sample_json": '{"result":{"message": "슈뢰딩거의 고양이 이론은 상자를 열어 관측하기 전까지 살아 있는 고양이와 죽어 있는 고양이가 중첩 상태로 공존한다는 이론이다."}}',
+        "result_example": 'Q."그때 이야기했던 세종대왕에 대해 이야기 해줘." A. {"result":{"message": "세종대왕은 훈민정음을 창제하여 백성들이 쉽게 글을 익히도록 하였다."}}'
+    }
+
     _chain = None
+    # 의미 기반 캐시는 사용자 입력만 비교한다.
+    _SEMANTIC_CACHE_FIELD = "input"
 
     def __init__(self):
         _template = [
             super()._COMMON_COMMAND_TEMPLATE,
             # 상속받은 자식 클래스에서 추가적으로 Template를 추가할 수 있도록 TemplatePattern을 적용
-            self._add_template()
+            *self._add_template()
         ]
-        self._chain = (ChatPromptTemplate.from_messages(_template) | super()._common_model)
+        # 사용자 입력({input})은 프롬프트의 마지막에 있으므로, 그 앞의 system prefix는 모든 요청에서 같다. (Ollama KV 캐시 재사용)
+        prompt = ChatPromptTemplate.from_messages(_template).partial(**self._FIXED_PARAMETERS)
+        self._chain = (prompt | super()._common_model())
 
-    def _get_chain(self):
+    def get_chain(self):
         return self._chain
 
     def _add_template(self)->list[tuple]:
         return [self._MAIN_TEMPLATE]
 
-    def invoke(self, parameter:dict)->dict:
+    def invoke(self, parameter:dict, use_cache:bool=True, priority:int=0)->dict:
         """
         요약:
             사용자의 대화기록으로 페르소나를 수정하는 함수
 
+        설명:
+            ainvoke(), astream(), invoke_many(), ainvoke_many()도 같은 인자를 받는다.
+
         Parameters:
             parameter(dict): parameter는 다음과 같은 key-value를 갖는다.
+                - input(str): 사용자의 입력
                 - session_history(list[str]): FastAPI가 실행된 후, 채팅방의 전체 대화 내역
                 - current_persona(dict): 대화 내역 본인의 에고 페르소나
+            use_cache(bool): False라면 응답 캐시를 사용하지 않는다.
+            priority(int): 대기열에서의 우선순위 (작을수록 먼저 실행된다)
 
         Raises:
             JSONDecodeError: JSON Decoding 실패 시, 빈 딕셔너리 반환
         """
-        parameter.update({
-            "role": "your my friend talking to me",
-            "guidelines": "takling to informally and using korean",
-            "output_schema": '```json {"result":{"message": "<sentence>"}} ```',
-            "sample_json": '{"result":{"message": "슈뢰딩거의 고양이 이론은 상자를 열어 관측하기 전까지 살아 있는 고양이와 죽어 있는 고양이가 중첩 상태로 공존한다는 이론이다."}}',
-            "result_example": 'Q."그때 이야기했던 세종대왕에 대해 이야기 해줘." A. {"result":{"message": "세종대왕은 훈민정음을 창제하여 백성들이 쉽게 글을 익히도록 하였다."}}'
-        })
-
-        return super().invoke(parameter)
\ No newline at end of file
+        return super().invoke(parameter, use_cache=use_cache, priority=priority)
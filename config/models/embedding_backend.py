@@ -0,0 +1,105 @@
+import os
+from abc import ABC, abstractmethod
+
+import torch
+from transformers import AutoModel
+
+# 임베딩 추론 백엔드 설정 (torch, int8, onnx)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# (선택) ONNX로 내보낸 모델을 저장할 디렉토리 *없다면 시작할 때마다 내보낸다.
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR")
+
+
+class EmbeddingBackend(ABC):
+    """
+    요약:
+        임베딩 모델의 forward를 수행하는 추론 백엔드 추상 클래스
+
+    설명:
+        백엔드는 토크나이징된 배치를 받아 마지막 hidden state를 반환하기만 한다.
+        CLS 풀링과 L2 정규화는 EmbeddingModel에서 수행하므로, 모든 백엔드의 결과가 같은 방식으로 후처리된다.
+
+    Attributes:
+        device(torch.device): 입력 텐서를 올릴 장치
+    """
+    device: torch.device = torch.device("cpu")
+
+    @abstractmethod
+    def forward(self, batch: dict[str, torch.Tensor]) -> torch.Tensor:
+        """
+        (batch, seq_len, hidden) 크기의 마지막 hidden state를 반환하는 함수
+        """
+        pass
+
+
+class TorchEmbeddingBackend(EmbeddingBackend):
+    """
+    PyTorch eager 모드 백엔드 (GPU 사용 가능 시 GPU, 아니라면 CPU fp32)
+    """
+    def __init__(self, model_name: str):
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu') # GPU 사용 가능 시 연산을 GPU에서 하도록 변경
+        self._model = AutoModel.from_pretrained(model_name, add_pooling_layer=False)
+        self._model.eval()
+        self._model.to(self.device)
+
+    def forward(self, batch: dict[str, torch.Tensor]) -> torch.Tensor:
+        with torch.no_grad():
+            return self._model(**batch)[0]
+
+
+class Int8EmbeddingBackend(TorchEmbeddingBackend):
+    """
+    Linear 계층의 가중치를 int8로 동적 양자화한 CPU 백엔드
+
+    가중치 메모리가 약 1/4로 줄고, CPU의 int8 행렬곱을 사용한다.
+    """
+    def __init__(self, model_name: str):
+        self.device = torch.device("cpu")
+        model = AutoModel.from_pretrained(model_name, add_pooling_layer=False)
+        model.eval()
+        self._model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """
+    ONNX로 내보낸 그래프를 onnxruntime으로 실행하는 CPU 백엔드
+
+    optimum[onnxruntime]이 설치되어 있어야 한다.
+    onnx_dir가 주어지면 내보낸 모델을 저장해 두고, 다음 실행부터는 저장된 모델을 불러온다.
+    """
+    def __init__(self, model_name: str, onnx_dir: str | None = EMBEDDING_ONNX_DIR):
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+        except ImportError as exception:
+            raise ImportError("EMBEDDING_BACKEND=onnx를 사용하려면 'pip install optimum[onnxruntime]'이 필요합니다.") from exception
+
+        path = os.path.join(onnx_dir, model_name.replace("/", "__")) if onnx_dir else None
+        if path and os.path.exists(os.path.join(path, "model.onnx")):
+            self._model = ORTModelForFeatureExtraction.from_pretrained(path)
+        else:
+            self._model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            if path:
+                self._model.save_pretrained(path)
+
+    def forward(self, batch: dict[str, torch.Tensor]) -> torch.Tensor:
+        return self._model(**batch).last_hidden_state
+
+
+_BACKENDS: dict[str, type[EmbeddingBackend]] = {
+    "torch": TorchEmbeddingBackend,
+    "int8": Int8EmbeddingBackend,
+    "onnx": OnnxEmbeddingBackend,
+}
+
+
+def create_backend(name: str, model_name: str) -> EmbeddingBackend:
+    """
+    이름에 해당하는 임베딩 추론 백엔드를 생성하는 함수
+
+    Parameters:
+        name: 백엔드 이름 (torch, int8, onnx)
+        model_name: HuggingFace 모델 명
+    """
+    if name not in _BACKENDS:
+        raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {name} (지원: {', '.join(_BACKENDS)})")
+    return _BACKENDS[name](model_name)
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from config.models.embedding_model import EmbeddingModel, embedding_model
+
+# 동적 배치 설정
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64"))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+
+
+@dataclass
+class _EmbeddingRequest:
+    texts: list[str]
+    future: Future = field(default_factory=Future)
+
+
+class EmbeddingBatcher:
+    """
+    요약:
+        동시에 들어온 임베딩 요청을 모아 한 번에 처리하는 클래스
+
+    설명:
+        첫 요청이 들어온 뒤 max_wait 동안(또는 텍스트 수가 max_batch_size에 도달할 때까지) 요청을 모아
+        EmbeddingModel.embedding_matrix()를 한 번만 호출하고, 결과 행렬을 복사 없이 잘라 각 요청자에게 돌려준다.
+        모델 호출은 하나의 작업 스레드에서 수행되며, 스레드는 첫 요청 시 시작된다.
+
+    Attributes:
+        _model(EmbeddingModel): 임베딩을 수행할 모델
+        _max_batch_size(int): 한 번에 처리할 최대 텍스트 수
+        _max_wait(float): 첫 요청 이후 다른 요청을 기다리는 최대 시간(초)
+        _requests(Queue): 처리 대기 중인 요청
+    """
+    def __init__(self, model: EmbeddingModel, max_batch_size: int = EMBEDDING_BATCH_MAX_SIZE,
+                 max_wait_ms: float = EMBEDDING_BATCH_MAX_WAIT_MS):
+        self._model = model
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._requests: queue.Queue[_EmbeddingRequest | None] = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, texts: list[str]) -> Future:
+        """
+        임베딩 요청을 등록하고 결과를 받을 Future를 반환하는 함수
+
+        Parameters:
+            texts(list[str]): 임베딩할 텍스트 리스트
+        """
+        request = _EmbeddingRequest(texts=list(texts))
+        if not request.texts:
+            request.future.set_result(np.empty((0, self._model.dimension), dtype=np.float16))
+            return request.future
+
+        self._start()
+        self._requests.put(request)
+        return request.future
+
+    def embedding(self, texts: list[str]) -> list[np.ndarray]:
+        """
+        요약:
+            텍스트 리스트를 임베딩하는 함수 (동기)
+
+        Returns:
+            [embedded_text1, embedded_text2, ...]
+        """
+        return list(self.embedding_matrix(texts))
+
+    async def aembedding(self, texts: list[str]) -> list[np.ndarray]:
+        """
+        요약:
+            텍스트 리스트를 임베딩하는 함수 (비동기)
+
+        Returns:
+            [embedded_text1, embedded_text2, ...]
+        """
+        return list(await self.aembedding_matrix(texts))
+
+    def embedding_matrix(self, texts: list[str]) -> np.ndarray:
+        """
+        요약:
+            텍스트 리스트를 (n, dim) float16 행렬로 임베딩하는 함수 (동기)
+        """
+        return self.submit(texts).result()
+
+    async def aembedding_matrix(self, texts: list[str]) -> np.ndarray:
+        """
+        요약:
+            텍스트 리스트를 (n, dim) float16 행렬로 임베딩하는 함수 (비동기)
+        """
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def close(self):
+        """
+        작업 스레드를 종료하는 함수
+
+        이미 등록된 요청은 모두 처리한 뒤 종료한다.
+        """
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._requests.put(None)
+            worker.join()
+
+    def _start(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+
+            batch = [request]
+            size = len(request.texts)
+            deadline = time.monotonic() + self._max_wait
+            stop = False
+
+            # 첫 요청 이후 max_wait 동안 다른 요청을 모은다.
+            while size < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch: list[_EmbeddingRequest]):
+        # 처리 전에 취소된 요청(예: 비동기 호출자의 취소)은 제외한다.
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            embeddings = self._model.embedding_matrix([text for request in batch for text in request.texts])
+        except Exception as exception:
+            for request in batch:
+                request.future.set_exception(exception)
+            return
+
+        start = 0
+        for request in batch:
+            end = start + len(request.texts)
+            request.future.set_result(embeddings[start:end])
+            start = end
+
+
+embedding_batcher = EmbeddingBatcher(embedding_model)
@@ -0,0 +1,193 @@
+import hashlib
+import os
+import threading
+import unicodedata
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+from config.cache.memory_cache import MemoryCache
+from config.common.common_cache import CacheStats
+
+try:
+    import fcntl
+except ImportError:  # Windows에서는 파일 잠금 없이 하나의 프로세스만 기록한다고 가정한다.
+    fcntl = None
+
+_KEY_SIZE = hashlib.sha256().digest_size
+
+
+class EmbeddingCache:
+    """
+    요약:
+        텍스트 내용으로 주소를 정하는(content-addressed) 임베딩 캐시
+
+    설명:
+        key는 (모델 명 + 정규화한 텍스트)의 SHA-256 해시이다.
+        1차 캐시는 메모리 LRU(MemoryCache), 2차 캐시는 디스크의 float16 행렬(np.memmap)과 key 목록 파일이다.
+        디스크 캐시는 재시작 후에도 유지된다.
+        여러 프로세스(uvicorn worker 등)가 같은 디렉토리를 사용할 수 있도록, 기록은 key 목록 파일의 잠금(flock) 안에서 수행한다.
+            - 기록 전에 다른 프로세스가 추가한 key를 읽어, 항상 파일의 끝에 이어서 기록한다.
+            - 다른 프로세스가 추가한 임베딩은 이 프로세스가 다음에 기록할 때부터 조회된다.
+
+    Attributes:
+        _model_name(str): 임베딩 모델 명 (key에 포함되어 모델이 바뀌면 캐시가 구분된다)
+        _dim(int): 임베딩 차원 수
+        _memory(MemoryCache): 1차 메모리 캐시 *None이면 사용하지 않는다.
+        _vectors(np.memmap): 2차 디스크 캐시의 (capacity, dim) float16 행렬 *None이면 사용하지 않는다.
+        _index(dict): key와 _vectors 행 번호의 매핑
+        _count(int): _vectors에 기록된 행 수
+    """
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(self, model_name: str, dim: int, directory: Optional[str] = None, memory_size: int = 10000):
+        self._model_name = model_name
+        self._dim = dim
+        self._memory = MemoryCache(max_size=memory_size, ttl=None) if memory_size > 0 else None
+        self._lock = threading.Lock()
+
+        self._vectors: Optional[np.memmap] = None
+        self._index: dict[bytes, int] = {}
+        self._count = 0
+        if directory:
+            self._open(os.path.join(directory, model_name.replace("/", "__")))
+
+    def get_many(self, texts: list[str]) -> list[Optional[np.ndarray]]:
+        """
+        캐시된 임베딩을 반환하는 함수
+
+        Returns:
+            텍스트 순서대로 임베딩, 캐시에 없다면 None
+        """
+        results = []
+        for text in texts:
+            key = self.key(text)
+            embedding = self._memory.get(key) if self._memory else None
+            if embedding is None and self._vectors is not None:
+                with self._lock:
+                    row = self._index.get(key)
+                    if row is not None:
+                        embedding = np.array(self._vectors[row])
+                if embedding is not None and self._memory:
+                    self._memory.set(key, embedding)
+            results.append(embedding)
+        return results
+
+    def put_many(self, texts: list[str], embeddings: list[np.ndarray]):
+        """
+        임베딩을 캐시에 저장하는 함수
+        """
+        keys = [self.key(text) for text in texts]
+
+        if self._memory:
+            for key, embedding in zip(keys, embeddings):
+                # 배치 행렬의 view를 저장하면 행 하나가 행렬 전체를 메모리에 붙잡으므로, 복사하여 저장한다.
+                self._memory.set(key, np.array(embedding, dtype=np.float16, copy=True))
+
+        if self._vectors is None:
+            return
+
+        with self._lock, self._file_lock():
+            self._sync()
+            appended = []
+            for key, embedding in zip(keys, embeddings):
+                if key in self._index:
+                    continue
+                if self._count == len(self._vectors):
+                    self._grow(len(self._vectors) * 2)
+                self._vectors[self._count] = embedding
+                self._index[key] = self._count
+                self._count += 1
+                appended.append(key)
+
+            if appended:
+                # 행렬을 먼저 기록한 뒤 key를 추가하여, 중간에 종료되어도 key가 빈 행을 가리키지 않도록 한다.
+                self._vectors.flush()
+                with open(self._index_path, "ab") as index_file:
+                    index_file.write(b"".join(appended))
+
+    def key(self, text: str) -> bytes:
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        return hashlib.sha256(f"{self._model_name}\0{normalized}".encode("utf-8")).digest()
+
+    def stats(self) -> Optional[CacheStats]:
+        """
+        메모리 캐시의 사용 통계를 반환하는 함수
+        """
+        return self._memory.stats() if self._memory else None
+
+    @property
+    def disk_size(self) -> int:
+        """
+        디스크 캐시에 저장된 임베딩 수
+        """
+        return self._count
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        다른 프로세스와 디스크 캐시 기록이 겹치지 않도록 key 목록 파일을 잠그는 함수
+        """
+        with open(self._index_path, "ab") as index_file:
+            if fcntl is not None:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index_file, fcntl.LOCK_UN)
+
+    def _sync(self):
+        """
+        다른 프로세스가 추가한 key를 읽어 _index와 _count에 반영하는 함수 *_file_lock() 안에서 호출한다.
+        """
+        with open(self._index_path, "rb") as index_file:
+            index_file.seek(self._count * _KEY_SIZE)
+            keys = index_file.read()
+        added = len(keys) // _KEY_SIZE
+        if not added:
+            return
+
+        for offset in range(added):
+            self._index[keys[offset * _KEY_SIZE:(offset + 1) * _KEY_SIZE]] = self._count + offset
+        self._count += added
+        # 다른 프로세스가 파일을 늘렸다면, 늘어난 크기로 다시 매핑한다.
+        rows = os.path.getsize(self._vectors_path) // (self._dim * 2)
+        if rows > len(self._vectors):
+            self._grow(rows)
+
+    def _open(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self._index_path = os.path.join(path, "index.bin")
+        self._vectors_path = os.path.join(path, "vectors.f16")
+
+        with self._file_lock():
+            self._load()
+
+    def _load(self):
+        keys = b""
+        if os.path.exists(self._index_path):
+            with open(self._index_path, "rb") as index_file:
+                keys = index_file.read()
+        rows = os.path.getsize(self._vectors_path) // (self._dim * 2) if os.path.exists(self._vectors_path) else 0
+
+        # 기록 도중 종료되어 행렬보다 많은 key가 남았다면, 잘라낸다.
+        self._count = min(len(keys) // _KEY_SIZE, rows)
+        if len(keys) != self._count * _KEY_SIZE:
+            with open(self._index_path, "r+b") as index_file:
+                index_file.truncate(self._count * _KEY_SIZE)
+        self._index = {keys[row * _KEY_SIZE:(row + 1) * _KEY_SIZE]: row for row in range(self._count)}
+
+        self._grow(max(rows, self._INITIAL_CAPACITY))
+
+    def _grow(self, capacity: int):
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+
+        with open(self._vectors_path, "ab"):
+            pass
+        if os.path.getsize(self._vectors_path) < capacity * self._dim * 2:
+            os.truncate(self._vectors_path, capacity * self._dim * 2)
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float16, mode="r+", shape=(capacity, self._dim))
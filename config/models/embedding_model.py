@@ -1,11 +1,38 @@
+import os
+import threading
+
 import numpy as np
 import torch
-from transformers import AutoModel, AutoTokenizer
+from transformers import AutoConfig, AutoTokenizer
 from transformers.utils import logging as hf_logging
 
+from config.models.embedding_backend import EMBEDDING_BACKEND, EmbeddingBackend, create_backend
+from config.models.embedding_cache import EmbeddingCache
+from config.models.embedding_worker_pool import EmbeddingWorkerPool
+
 # 허깅페이스 로깅 레벨을 ERROR 이상으로 설정
 hf_logging.set_verbosity_error()
 
+EMBEDDINGS_MODEL = "dragonkue/snowflake-arctic-embed-l-v2.0-ko"
+
+# 한 번의 forward에 넣을 최대 토큰 수 (패딩 포함, 배치 크기 x 최대 길이)
+EMBEDDING_TOKEN_BUDGET = int(os.getenv("EMBEDDING_TOKEN_BUDGET", "16384"))
+
+# 임베딩 캐시 설정 (EMBEDDING_CACHE_DIR가 없다면 메모리 캐시만 사용한다)
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR")
+
+# 임베딩 작업 프로세스 설정 (0이면 API 프로세스에서 직접 임베딩한다)
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "0"))
+EMBEDDING_WORKER_THREADS = int(os.getenv("EMBEDDING_WORKER_THREADS", "0"))
+EMBEDDING_WORKER_MAX_ROWS = int(os.getenv("EMBEDDING_WORKER_MAX_ROWS", "256"))
+
+# NumPy 자료형과 torch 자료형의 매핑
+_TORCH_DTYPES = {
+    np.dtype(np.float16): torch.float16,
+    np.dtype(np.float32): torch.float32,
+}
+
 class EmbeddingModel:
     """
     요약:
@@ -13,42 +40,215 @@ class EmbeddingModel:
 
     설명:
         모델은 HuggingFace의 'dragonkue/snowflake-arctic-embed-l-v2.0-ko'를 사용하였다.
+        텍스트를 토큰 길이 순으로 정렬한 뒤, token_budget 이하의 묶음(bucket)으로 나누어 임베딩한다.
+        비슷한 길이끼리 묶이므로 짧은 텍스트가 긴 텍스트 길이만큼 패딩되지 않는다.
+        이미 임베딩한 텍스트는 EmbeddingCache에서 찾아 반환하고, 캐시에 없는 텍스트만 모델로 임베딩한다.
+        모델은 생성 시점이 아닌 첫 임베딩(또는 warmup()) 시점에 불러온다.
+        workers가 1 이상이면 모델을 이 프로세스가 아닌 EmbeddingWorkerPool의 작업 프로세스에 올린다.
+        forward는 backend(torch, int8, onnx)가 수행하며, CLS 풀링과 L2 정규화는 백엔드와 관계없이 이 클래스에서 수행한다.
 
     Attributes:
         __tokenizer: 문장을 형태소 단위로 분리하기 위한 객체
-        __model: 임베딩을 생성하기 위한 객체
-        __device: 임베딩에 GPU를 사용하기 위한 객체
+        __backend(EmbeddingBackend): 임베딩 모델의 forward를 수행하는 추론 백엔드
+        __backend_name(str): 추론 백엔드 이름
+        __token_budget: 한 번의 forward에 넣을 최대 토큰 수
+        __cache: 임베딩 캐시 *None이면 사용하지 않는다.
+        __pool: 임베딩 작업 풀 *None이면 이 프로세스에서 직접 임베딩한다.
+        __lock: 모델을 한 번만 불러오기 위한 동기화 Flag 객체
     """
-    def __init__(self):
-        EMBEDDINGS_MODEL = "dragonkue/snowflake-arctic-embed-l-v2.0-ko"
+    def __init__(self, token_budget: int = EMBEDDING_TOKEN_BUDGET,
+                 cache_size: int = EMBEDDING_CACHE_SIZE, cache_dir: str | None = EMBEDDING_CACHE_DIR,
+                 workers: int = EMBEDDING_WORKERS, backend: str = EMBEDDING_BACKEND):
+        self.__tokenizer = None
+        self.__backend: EmbeddingBackend | None = None
+        self.__backend_name = backend
+        self.__pool = None
+        self.__workers = workers
+        self.__loaded = False
+        self.__token_budget = token_budget
+        self.__cache = None
+        self.__cache_size = cache_size
+        self.__cache_dir = cache_dir
+        self.__dimension = None
+        self.__lock = threading.Lock()
+
+    def _load(self):
+        """
+        토크나이저, 모델(또는 작업 풀), 캐시를 불러오는 함수
+
+        여러 스레드에서 동시에 호출해도 한 번만 불러온다.
+        """
+        if self.__loaded:
+            return
+
+        with self.__lock:
+            if self.__loaded:
+                return
+
+            if self.__workers > 0:
+                self.__pool = EmbeddingWorkerPool(
+                    workers=self.__workers,
+                    dim=self.dimension,
+                    threads_per_worker=EMBEDDING_WORKER_THREADS,
+                    max_rows=EMBEDDING_WORKER_MAX_ROWS
+                )
+            else:
+                self.__tokenizer = AutoTokenizer.from_pretrained(EMBEDDINGS_MODEL)
+                self.__backend = create_backend(self.__backend_name, EMBEDDINGS_MODEL)
 
-        self.__tokenizer = AutoTokenizer.from_pretrained(EMBEDDINGS_MODEL)
-        self.__model = AutoModel.from_pretrained(EMBEDDINGS_MODEL, add_pooling_layer=False)
-        self.__model.eval()
-        self.__device = torch.device('cuda' if torch.cuda.is_available() else 'cpu') # GPU 사용 가능 시 연산을 GPU에서 하도록 변경
-        self.__model.to(self.__device)
+            self.__cache = EmbeddingCache(
+                model_name=EMBEDDINGS_MODEL,
+                dim=self.dimension,
+                directory=self.__cache_dir,
+                memory_size=self.__cache_size
+            ) if self.__cache_size > 0 or self.__cache_dir else None
+            self.__loaded = True
 
-    def embedding(self, texts: list[str]) -> list[np.ndarray]:
+    def close(self):
+        """
+        임베딩 작업 풀을 종료하는 함수
+        """
+        if self.__pool is not None:
+            self.__pool.close()
+
+    def warmup(self):
+        """
+        모델을 미리 불러오고, 짧은 텍스트를 한 번 임베딩하여 첫 요청의 지연을 없애는 함수
+        """
+        self._load()
+        self._embed(["임베딩 모델 준비"], self.__token_budget)
+
+    @property
+    def dimension(self) -> int:
+        """
+        임베딩 차원 수
+
+        모델을 불러오지 않고 모델 설정(config.json)에서 읽는다.
+        """
+        if self.__dimension is None:
+            self.__dimension = AutoConfig.from_pretrained(EMBEDDINGS_MODEL).hidden_size
+        return self.__dimension
+
+    def embedding(self, texts: list[str], token_budget: int | None = None) -> list[np.ndarray]:
         """
         요약:
             텍스트 리스트를 임베딩하는 함수
 
+        설명:
+            embedding_matrix()의 각 행(복사 없는 view)을 리스트로 반환한다.
+
         Parameters:
             texts: 임베딩할 텍스트 리스트
+            token_budget: 한 번의 forward에 넣을 최대 토큰 수 *default: 생성 시 지정한 값
 
         Returns:
             [embedded_text1, embedded_text2, ...]
         """
-        # 토크나이징
-        tokens = self.__tokenizer(texts, padding=True, truncation=True, return_tensors='pt', max_length=8192)
-        tokens = {key: val.to(self.__device) for key, val in tokens.items()}
+        if not texts:
+            return []
+
+        return list(self.embedding_matrix(texts, token_budget=token_budget))
+
+    def embedding_matrix(self, texts: list[str], dtype: type = np.float16, token_budget: int | None = None) -> np.ndarray:
+        """
+        요약:
+            텍스트 리스트를 하나의 연속된 (n, dim) 행렬로 임베딩하는 함수
+
+        설명:
+            모든 묶음의 결과를 장치(GPU/CPU)에서 모은 뒤, 한 번의 형 변환과 한 번의 복사로 NumPy 행렬을 만든다.
+            MilvusDatabase.insert(vectors=...)와 range_select(data=...)에 그대로 전달할 수 있다.
+
+        Parameters:
+            texts: 임베딩할 텍스트 리스트
+            dtype: 반환할 행렬의 자료형 (np.float16 또는 np.float32)
+            token_budget: 한 번의 forward에 넣을 최대 토큰 수 *default: 생성 시 지정한 값
+
+        Returns:
+            (len(texts), dim) 행렬
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=dtype)
+
+        self._load()
+        token_budget = token_budget or self.__token_budget
+        if self.__cache is None:
+            return self._embed(texts, token_budget, dtype)
+
+        # 캐시에 없는 텍스트만 (중복 없이) 임베딩한다.
+        cached = self.__cache.get_many(texts)
+        misses = list(dict.fromkeys(text for text, embedding in zip(texts, cached) if embedding is None))
+
+        embeddings = np.empty((len(texts), self.dimension), dtype=dtype)
+        miss_rows = []
+        for row, embedding in enumerate(cached):
+            if embedding is None:
+                miss_rows.append(row)
+            else:
+                embeddings[row] = embedding
+
+        if misses:
+            computed = self._embed(misses, token_budget, dtype)
+            self.__cache.put_many(misses, computed)
+            positions = {text: position for position, text in enumerate(misses)}
+            embeddings[miss_rows] = computed[[positions[texts[row]] for row in miss_rows]]
+        return embeddings
+
+    def cache_stats(self):
+        """
+        임베딩 메모리 캐시의 사용 통계를 반환하는 함수
+        """
+        return self.__cache.stats() if self.__cache else None
+
+    def _embed(self, texts: list[str], token_budget: int, dtype: type = np.float16) -> np.ndarray:
+        """
+        캐시를 거치지 않고 모델로 임베딩하는 함수
+        """
+        if self.__pool is not None:
+            return self.__pool.embed(texts, dtype, token_budget)
+
+        # 토크나이징 (패딩 없이 길이만 확인한다)
+        tokens = self.__tokenizer(texts, truncation=True, max_length=8192)
+        lengths = [len(input_ids) for input_ids in tokens["input_ids"]]
 
-        # 임베딩 생성
-        with torch.no_grad():
-            outputs = self.__model(**tokens)[0][:, 0]  # CLS 토큰
-            embeddings = torch.nn.functional.normalize(outputs, p=2, dim=1)
+        embeddings = None
+        for bucket in self._buckets(lengths, token_budget):
+            batch = self.__tokenizer.pad(
+                {key: [values[index] for index in bucket] for key, values in tokens.items()},
+                return_tensors='pt'
+            )
+            device = self.__backend.device
+            batch = {key: val.to(device) for key, val in batch.items()}
 
-        # NumPy 배열로 반환
-        return [embedding.cpu().numpy().astype(np.float16) for embedding in embeddings]
+            # 임베딩 생성
+            with torch.no_grad():
+                outputs = self.__backend.forward(batch)[:, 0]  # CLS 토큰
+                bucket_embeddings = torch.nn.functional.normalize(outputs, p=2, dim=1)
+
+            # 원래 순서의 위치에 기록한다.
+            if embeddings is None:
+                embeddings = torch.empty((len(texts), bucket_embeddings.shape[1]), dtype=bucket_embeddings.dtype, device=device)
+            embeddings[torch.tensor(bucket, device=device)] = bucket_embeddings
+
+        # 장치에서 한 번 형 변환한 뒤, 한 번에 NumPy 행렬로 복사한다.
+        return embeddings.to(_TORCH_DTYPES[np.dtype(dtype)]).cpu().numpy()
+
+    @staticmethod
+    def _buckets(lengths: list[int], token_budget: int) -> list[list[int]]:
+        """
+        텍스트의 위치를 토큰 길이 순으로 정렬한 뒤, (묶음 크기 x 묶음의 최대 길이)가 token_budget 이하가 되도록 나눈다.
+
+        token_budget보다 긴 텍스트는 단독으로 하나의 묶음이 된다.
+        """
+        buckets = []
+        bucket = []
+        for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+            # 길이 오름차순이므로, 현재 텍스트의 길이가 묶음의 최대 길이가 된다.
+            if bucket and (len(bucket) + 1) * lengths[index] > token_budget:
+                buckets.append(bucket)
+                bucket = []
+            bucket.append(index)
+        if bucket:
+            buckets.append(bucket)
+        return buckets
 
-embedding_model = EmbeddingModel()
\ No newline at end of file
+embedding_model = EmbeddingModel()
@@ -0,0 +1,291 @@
+import atexit
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+def _worker_main(connection: Connection, shm_name: str, max_rows: int, dim: int, threads: int, cpus: list[int] | None):
+    """
+    임베딩 작업 프로세스의 진입점
+
+    지정된 CPU에 고정(pin)하고 torch 스레드 수를 맞춘 뒤 모델을 불러온다.
+    요청받은 텍스트를 임베딩하여 공유 메모리 버퍼에 기록하고, 기록한 행 수를 응답한다.
+    """
+    import torch
+
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    torch.set_num_threads(threads)
+
+    # 작업 프로세스에서는 캐시와 작업 풀 없이 모델을 직접 사용한다.
+    from config.models.embedding_model import EmbeddingModel
+    model = EmbeddingModel(cache_size=0, cache_dir=None, workers=0)
+    model.warmup()
+
+    shm = SharedMemory(name=shm_name)
+    output = np.ndarray((max_rows, dim), dtype=np.float32, buffer=shm.buf)
+    connection.send(("ready", None))
+
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+
+            texts, token_budget = message
+            try:
+                output[:len(texts)] = model.embedding_matrix(texts, dtype=np.float32, token_budget=token_budget)
+                connection.send(("ok", len(texts)))
+            except Exception as exception:
+                connection.send(("error", repr(exception)))
+    finally:
+        del output
+        shm.close()
+
+
+@dataclass
+class _Worker:
+    index: int
+    process: BaseProcess
+    connection: Connection
+    shm: SharedMemory
+    output: np.ndarray
+
+
+class EmbeddingWorkerPool:
+    """
+    요약:
+        여러 프로세스에서 임베딩 모델을 실행하는 작업 풀
+
+    설명:
+        CPU 전용 환경에서 임베딩 연산이 API 프로세스의 GIL을 점유하지 않도록, N개의 프로세스에 모델을 하나씩 올린다.
+        각 프로세스는 서로 다른 CPU 묶음에 고정되며, torch 스레드 수는 (CPU 수 / 프로세스 수)로 맞춘다.
+        결과는 프로세스별 공유 메모리 버퍼에 float32 행렬로 기록되어 pickle 없이 전달된다.
+        작업 프로세스가 비정상 종료되면 같은 자리에 새 프로세스를 띄우고, 실패한 요청을 한 번 다시 실행한다.
+            - 새 프로세스는 respawn_attempts번까지 지수적으로 대기하며 띄운다.
+            - 그래도 실패한 자리는 유지되며, 대기 시간이 지난 뒤의 요청에서 다시 띄운다.
+            - 살아 있는 작업 프로세스가 하나도 없다면 요청은 기다리지 않고 RuntimeError로 실패한다.
+        EmbeddingModel(workers=N)으로 생성하면 embedding() API가 이 풀을 사용한다.
+
+    Attributes:
+        _dim(int): 임베딩 차원 수
+        _max_rows(int): 한 번의 요청으로 작업 프로세스에 보낼 최대 텍스트 수 (공유 메모리 버퍼 크기)
+        _workers(list[_Worker]): 살아 있는 작업 프로세스
+        _dead(dict[int, float]): 다시 띄우지 못한 자리(index)와 다시 시도할 시각
+        _idle(Queue): 요청을 받을 수 있는 작업 프로세스
+        _executor(ThreadPoolExecutor): 작업 프로세스의 응답을 기다리는 스레드
+    """
+    # 요청이 작업 프로세스를 기다리는 중에 풀의 상태(살아 있는 프로세스 수)를 확인하는 주기(초)
+    _IDLE_POLL_INTERVAL = 0.1
+
+    def __init__(self, workers: int, dim: int, threads_per_worker: int = 0, max_rows: int = 256,
+                 respawn_attempts: int = 3, respawn_backoff: float = 1.0):
+        self._context = multiprocessing.get_context("spawn")
+        self._cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+        self._threads = threads_per_worker or max(1, len(self._cpus) // workers)
+        # CPU가 충분할 때만 프로세스마다 겹치지 않는 CPU 묶음에 고정한다.
+        self._pin = workers * self._threads <= len(self._cpus)
+
+        self._dim = dim
+        self._max_rows = max_rows
+        self._respawn_attempts = respawn_attempts
+        self._respawn_backoff = respawn_backoff
+        self._workers: list[_Worker] = [self._spawn(index) for index in range(workers)]
+        self._dead: dict[int, float] = {}
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._lock = threading.Lock()
+
+        # 모든 작업 프로세스가 모델을 불러올 때까지 기다린다.
+        for worker in self._workers:
+            try:
+                self._wait_ready(worker)
+            except RuntimeError:
+                self.close()
+                raise
+            self._idle.put(worker)
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embedding-worker")
+        atexit.register(self.close)
+
+    def embed(self, texts: list[str], dtype: type = np.float16, token_budget: int | None = None) -> np.ndarray:
+        """
+        텍스트를 작업 프로세스에 나누어 임베딩하고, 원래 순서의 (n, dim) 행렬로 반환하는 함수
+        """
+        with self._lock:
+            live = len(self._workers)
+            if not live and not self._dead:
+                raise RuntimeError("임베딩 작업 풀이 종료되었습니다.")
+        embeddings = np.empty((len(texts), self._dim), dtype=dtype)
+        chunk_size = min(self._max_rows, max(1, math.ceil(len(texts) / max(1, live))))
+
+        futures = [
+            self._executor.submit(self._run, texts[start:start + chunk_size], embeddings[start:start + chunk_size], token_budget)
+            for start in range(0, len(texts), chunk_size)
+        ]
+        for future in futures:
+            future.result()
+        return embeddings
+
+    def close(self):
+        """
+        실행 중인 요청이 끝나기를 기다린 뒤, 작업 프로세스를 종료하고 공유 메모리를 해제하는 함수
+        """
+        # 실행 중인 _run()이 파이프를 사용하고 있으므로, 먼저 끝나기를 기다린다.
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=True)
+        with self._lock:
+            workers, self._workers = self._workers, []
+            self._dead.clear()
+        for worker in workers:
+            try:
+                worker.connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in workers:
+            self._stop(worker)
+
+    def _spawn(self, index: int) -> _Worker:
+        """
+        index번째 CPU 묶음에 고정된 작업 프로세스를 시작하는 함수 *준비될 때까지 기다리지 않는다.
+        """
+        shm = SharedMemory(create=True, size=self._max_rows * self._dim * np.dtype(np.float32).itemsize)
+        parent, child = self._context.Pipe()
+        cpus = self._cpus[index * self._threads:(index + 1) * self._threads] if self._pin else None
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child, shm.name, self._max_rows, self._dim, self._threads, cpus),
+            name=f"embedding-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        child.close()
+        return _Worker(
+            index=index,
+            process=process,
+            connection=parent,
+            shm=shm,
+            output=np.ndarray((self._max_rows, self._dim), dtype=np.float32, buffer=shm.buf)
+        )
+
+    @staticmethod
+    def _wait_ready(worker: _Worker):
+        try:
+            status, payload = worker.connection.recv()
+        except (EOFError, OSError) as exception:
+            status, payload = "error", repr(exception)
+        if status != "ready":
+            raise RuntimeError(f"임베딩 작업 프로세스 시작 실패: {payload}")
+
+    @staticmethod
+    def _stop(worker: _Worker):
+        worker.process.join(timeout=10)
+        if worker.process.is_alive():
+            worker.process.terminate()
+        worker.connection.close()
+        worker.output = None
+        worker.shm.close()
+        worker.shm.unlink()
+
+    def _respawn(self, index: int):
+        """
+        index 자리에 새 작업 프로세스를 띄워 대기열에 넣는 함수
+
+        respawn_attempts번까지 지수적으로 대기하며 시도하고, 모두 실패하면 자리를 _dead에 남기고 RuntimeError를 발생시킨다.
+        """
+        failure = None
+        for attempt in range(self._respawn_attempts):
+            if attempt:
+                time.sleep(self._respawn_backoff * (2 ** (attempt - 1)))
+            worker = self._spawn(index)
+            try:
+                self._wait_ready(worker)
+            except RuntimeError as exception:
+                worker.process.terminate()
+                self._stop(worker)
+                failure = exception
+                continue
+            with self._lock:
+                self._workers.append(worker)
+            self._idle.put(worker)
+            return
+
+        with self._lock:
+            self._dead[index] = time.monotonic() + self._respawn_backoff * (2 ** self._respawn_attempts)
+        raise RuntimeError(f"임베딩 작업 프로세스를 다시 띄우지 못했습니다. (index={index}) {failure}")
+
+    def _revive(self):
+        """
+        다시 시도할 시각이 지난 자리에 작업 프로세스를 띄우는 함수 *실패한 자리는 다음 시각에 다시 시도한다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            indexes = [index for index, retry_at in self._dead.items() if retry_at <= now]
+            for index in indexes:
+                del self._dead[index]
+        for index in indexes:
+            try:
+                self._respawn(index)
+            except RuntimeError:
+                pass
+
+    def _acquire(self) -> _Worker:
+        """
+        요청을 받을 수 있는 작업 프로세스를 반환하는 함수
+
+        Raises:
+            RuntimeError: 살아 있는 작업 프로세스가 없는 경우 *기다리지 않는다.
+        """
+        while True:
+            self._revive()
+            try:
+                return self._idle.get(timeout=self._IDLE_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+            with self._lock:
+                if not self._workers:
+                    raise RuntimeError("사용 가능한 임베딩 작업 프로세스가 없습니다.")
+
+    def _discard(self, worker: _Worker):
+        """
+        비정상 종료된 작업 프로세스를 정리하고 목록에서 제거하는 함수
+        """
+        worker.process.terminate()
+        self._stop(worker)
+        with self._lock:
+            self._workers.remove(worker)
+
+    def _run(self, texts: list[str], output: np.ndarray, token_budget: int | None, retry: bool = True):
+        worker = self._acquire()
+        try:
+            worker.connection.send((texts, token_budget))
+            status, payload = worker.connection.recv()
+        except (EOFError, OSError):
+            # 작업 프로세스가 종료되었다면 새 프로세스로 교체하고, 한 번만 다시 실행한다.
+            self._discard(worker)
+            try:
+                self._respawn(worker.index)
+            except RuntimeError:
+                if not retry:
+                    raise
+            if not retry:
+                raise RuntimeError(f"임베딩 작업 프로세스가 비정상 종료되었습니다. (exitcode={worker.process.exitcode})")
+            # 교체하지 못했다면 다른 작업 프로세스에서 실행한다. (없다면 _acquire()가 RuntimeError를 발생시킨다)
+            return self._run(texts, output, token_budget, retry=False)
+
+        try:
+            if status != "ok":
+                raise RuntimeError(f"임베딩 작업 프로세스 실행 실패: {payload}")
+            # 공유 메모리 버퍼에서 결과 행렬의 해당 위치로 한 번 복사(및 형 변환)한다.
+            output[:] = worker.output[:payload]
+        finally:
+            self._idle.put(worker)
@@ -0,0 +1,60 @@
+"""
+요약:
+    임베딩 추론 백엔드(int8, onnx)의 결과가 기준(torch fp32)과 호환되는지 확인하는 테스트
+
+설명:
+    같은 문장을 각 백엔드로 임베딩하여, 기준 임베딩과의 행별 코사인 유사도가 TOLERANCE 이상인지 확인한다.
+    모델 가중치를 불러올 수 없거나 optimum[onnxruntime]이 설치되지 않았다면 건너뛴다.
+
+실행:
+    python -m pytest test/test_embedding_backend.py
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from config.models.embedding_model import EMBEDDINGS_MODEL, EmbeddingModel
+
+# 기준 임베딩과의 최소 코사인 유사도
+TOLERANCE = 0.98
+
+SENTENCES = [
+    "점심으로 김치찌개를 먹었고 너무 매워서 물을 많이 마셨어.",
+    "세종대왕은 훈민정음을 창제하여 백성들이 쉽게 글을 익히도록 하였다.",
+    "슈뢰딩거의 고양이 이론은 관측하기 전까지 두 상태가 중첩되어 공존한다는 이론이다.",
+    "내일 오전 10시에 회의실 B에서 분기 실적 보고가 있습니다.",
+    "The quick brown fox jumps over the lazy dog.",
+    "짧은 문장",
+]
+
+
+def _embed(backend: str) -> np.ndarray:
+    # 캐시와 작업 프로세스 없이 백엔드의 결과만 비교한다.
+    model = EmbeddingModel(cache_size=0, cache_dir=None, workers=0, backend=backend)
+    try:
+        return model.embedding_matrix(SENTENCES, dtype=np.float32)
+    except OSError as exception:
+        pytest.skip(f"임베딩 모델 가중치를 불러올 수 없습니다: {exception}")
+
+
+@pytest.fixture(scope="module")
+def baseline() -> np.ndarray:
+    return _embed("torch")
+
+
+@pytest.mark.parametrize("backend", ["int8", "onnx"])
+def test_backend_matches_float_baseline(backend: str, baseline: np.ndarray):
+    if backend == "onnx":
+        pytest.importorskip("optimum.onnxruntime")
+
+    embeddings = _embed(backend)
+
+    assert embeddings.shape == baseline.shape
+    # 두 임베딩 모두 L2 정규화되어 있으므로 행별 내적이 코사인 유사도이다.
+    np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-3)
+    similarities = np.sum(embeddings * baseline, axis=1)
+    assert similarities.min() >= TOLERANCE, (
+        f"{backend} 백엔드의 코사인 유사도가 {TOLERANCE} 미만입니다: {similarities.round(4).tolist()} ({EMBEDDINGS_MODEL})"
+    )
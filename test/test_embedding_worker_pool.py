@@ -0,0 +1,91 @@
+"""
+요약:
+    임베딩 작업 풀이 작업 프로세스의 비정상 종료와 재시작 실패를 처리하는지 확인하는 테스트
+
+설명:
+    모델 대신 텍스트 길이를 기록하는 가짜 작업 프로세스를 사용한다.
+    FAIL_ENV 환경 변수가 있으면 새로 띄운 작업 프로세스는 준비되기 전에 종료된다. (spawn된 프로세스는 시작 시점의 환경 변수를 물려받는다)
+
+실행:
+    python -m pytest test/test_embedding_worker_pool.py
+"""
+import os
+import signal
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from config.models import embedding_worker_pool
+from config.models.embedding_worker_pool import EmbeddingWorkerPool
+
+FAIL_ENV = "EMBEDDING_WORKER_POOL_TEST_FAIL"
+
+
+def _fake_worker_main(connection, shm_name, max_rows, dim, threads, cpus):
+    from multiprocessing.shared_memory import SharedMemory
+
+    if os.environ.get(FAIL_ENV):
+        os._exit(1)
+    shm = SharedMemory(name=shm_name)
+    output = np.ndarray((max_rows, dim), dtype=np.float32, buffer=shm.buf)
+    connection.send(("ready", None))
+    try:
+        while (message := connection.recv()) is not None:
+            texts, _ = message
+            output[:len(texts)] = [[len(text)] * dim for text in texts]
+            connection.send(("ok", len(texts)))
+    finally:
+        del output
+        shm.close()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(embedding_worker_pool, "_worker_main", _fake_worker_main)
+    monkeypatch.delenv(FAIL_ENV, raising=False)
+    pool = EmbeddingWorkerPool(workers=1, dim=2, max_rows=4, respawn_attempts=2, respawn_backoff=0.01)
+    yield pool
+    pool.close()
+
+
+def _kill(pool: EmbeddingWorkerPool):
+    process = pool._workers[0].process
+    os.kill(process.pid, signal.SIGKILL)
+    process.join(timeout=10)
+
+
+def test_respawns_dead_worker(pool):
+    _kill(pool)
+
+    embeddings = pool.embed(["a", "abc"], dtype=np.float32)
+
+    np.testing.assert_array_equal(embeddings[:, 0], [1, 3])
+
+
+def test_failed_respawn_raises_and_keeps_slot(pool, monkeypatch):
+    monkeypatch.setenv(FAIL_ENV, "1")
+    _kill(pool)
+
+    # 살아 있는 작업 프로세스가 없으므로, 나누기 0이나 무한 대기 없이 실패해야 한다.
+    with pytest.raises(RuntimeError):
+        pool.embed(["a", "abc"], dtype=np.float32)
+    assert pool._dead and not pool._workers
+
+    # 자리는 유지되므로, 다시 띄울 수 있게 되면 이후 요청에서 복구된다.
+    monkeypatch.delenv(FAIL_ENV)
+    time.sleep(0.1)
+    embeddings = pool.embed(["ab"], dtype=np.float32)
+    np.testing.assert_array_equal(embeddings[:, 0], [2])
+
+
+def test_close_does_not_hang_without_workers(pool, monkeypatch):
+    monkeypatch.setenv(FAIL_ENV, "1")
+    _kill(pool)
+    with pytest.raises(RuntimeError):
+        pool.embed(["a"], dtype=np.float32)
+
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.embed(["a"], dtype=np.float32)